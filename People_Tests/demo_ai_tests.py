@@ -32,6 +32,7 @@ from tests.ai_tests.test_utils import (
     draw_bounding_boxes,
     find_image_path,
     filter_people,
+    PERSON_NAMES,
     create_json_output,
     save_json_output,
     setup_output_directory
@@ -442,7 +443,7 @@ def main():
         if result['all_objects']:
             print(f"\n  Objects from API:")
             for name, score in result['all_objects']:
-                is_person = name.lower() in ['person', 'people', 'pedestrian']
+                is_person = name.lower() in PERSON_NAMES
                 marker = " <-- PERSON" if is_person else ""
                 print(f"    - {name}: {score*100:.1f}%{marker}")
 
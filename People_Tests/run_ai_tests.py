@@ -9,11 +9,16 @@ This script:
 """
 
 import os
+import re
 import sys
 import json
 import time
 import subprocess
 
+# Result line each AI test prints, e.g.
+# TEST CASE PT-01: PASS (Expected: 1, Detected: 1)
+RESULT_LINE_RE = re.compile(r'TEST CASE [\w-]+: (PASS|FAIL) \(Expected: (\d+), Detected: (\d+)\)')
+
 
 def find_venv_python():
     """Find the Python executable in the virtual environment"""
@@ -70,9 +75,7 @@ class AITestRunner:
             output = result.stdout + result.stderr
 
             # Extract pass/fail and counts from output
-            import re
-            # New format: TEST CASE PT-01: PASS (Expected: 1, Detected: 1)
-            match = re.search(r'TEST CASE [\w-]+: (PASS|FAIL) \(Expected: (\d+), Detected: (\d+)\)', output)
+            match = RESULT_LINE_RE.search(output)
             if match:
                 status = match.group(1)
                 expected = int(match.group(2))
@@ -14,8 +14,14 @@ import sys
 import json
 import time
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 # from generate_report import ReportGenerator  # Commented out - optional report generation
 
+# Test scripts spend most of their time waiting on the Vision API, so several
+# can run at once (bounded to stay within API quota)
+MAX_PARALLEL_TESTS = 8
+
+
 class TestRunner:
     def __init__(self, tests_dir, results_dir):
         self.tests_dir = tests_dir
@@ -35,8 +41,13 @@ class TestRunner:
     def run_single_test(self, test_file):
         """Run a single test and return its result"""
         test_name = os.path.basename(test_file)
-        print(f"Running {test_name}...", end=' ')
-        sys.stdout.flush()
+        result = self._run_test_process(test_file)
+        # One print per test so lines from concurrent tests don't interleave
+        print(f"Running {test_name}... {result.pop('label')}", flush=True)
+        return result
+
+    def _run_test_process(self, test_file):
+        """Run a test script in a subprocess and classify its output"""
 
         try:
             # Run the test
@@ -50,21 +61,16 @@ class TestRunner:
             # Check if test passed or failed from output
             output = result.stdout + result.stderr
             if 'PASS ✓' in output:
-                print('✓ PASS')
-                return {'status': 'PASS', 'output': output}
+                return {'status': 'PASS', 'output': output, 'label': '✓ PASS'}
             elif 'FAIL ✗' in output:
-                print('✗ FAIL')
-                return {'status': 'FAIL', 'output': output}
+                return {'status': 'FAIL', 'output': output, 'label': '✗ FAIL'}
             else:
-                print('? UNKNOWN')
-                return {'status': 'ERROR', 'output': output}
+                return {'status': 'ERROR', 'output': output, 'label': '? UNKNOWN'}
 
         except subprocess.TimeoutExpired:
-            print('✗ TIMEOUT')
-            return {'status': 'TIMEOUT', 'output': 'Test timed out after 120 seconds'}
+            return {'status': 'TIMEOUT', 'output': 'Test timed out after 120 seconds', 'label': '✗ TIMEOUT'}
         except Exception as e:
-            print(f'✗ ERROR: {e}')
-            return {'status': 'ERROR', 'output': str(e)}
+            return {'status': 'ERROR', 'output': str(e), 'label': f'✗ ERROR: {e}'}
 
     def load_json_results(self):
         """Load all JSON result files"""
@@ -92,9 +98,13 @@ class TestRunner:
 
         self.start_time = time.time()
 
-        for test_file in test_files:
+        # Tests are independent, so overlap their API calls; results are
+        # still collected in file order
+        with ThreadPoolExecutor(max_workers=MAX_PARALLEL_TESTS) as executor:
+            results = list(executor.map(self.run_single_test, test_files))
+
+        for test_file, result in zip(test_files, results):
             test_name = os.path.basename(test_file).replace('.py', '')
-            result = self.run_single_test(test_file)
             self.test_results.append({
                 'test_id': test_name,
                 'status': result['status'],
@@ -109,6 +119,32 @@ class TestRunner:
         print("="*80)
         print()
 
+def print_detection_summary(json_results):
+    """Print suite-wide detection figures computed from the JSON results"""
+    # Error results (e.g. missing images) have no counts to summarize
+    results = [r for r in json_results.values() if 'actual_results' in r]
+    if not results:
+        return
+
+    # Imported here so a run with no results never loads NumPy/Pillow
+    import numpy as np
+    from tests.conventional_tests.test_utils import calculate_metrics_batch
+
+    metrics = calculate_metrics_batch(
+        [r['test_configuration']['expected_people_count'] for r in results],
+        [r['actual_results']['detected_people'] for r in results],
+        [r['test_configuration']['group_size_category'] for r in results]
+    )
+    # Tests expecting no people (e.g. BVA-001) have no detection rate; they
+    # only show up as false positives
+    has_people = np.array([r['test_configuration']['expected_people_count'] > 0 for r in results])
+    if has_people.any():
+        print(f"Mean Detection Rate: {metrics['detection_rate'][has_people].mean():.1f}% "
+              f"over {int(has_people.sum())} tests with people (Target: 85%)")
+    print(f"False Positives: {int(metrics['false_positives'].sum())}, "
+          f"False Negatives: {int(metrics['false_negatives'].sum())}")
+
+
 def main():
     """Main function"""
     # Setup paths
@@ -184,6 +220,7 @@ def main():
     passed = sum(1 for t in runner.test_results if t['status'] == 'PASS')
     total = len(runner.test_results)
     print(f"Tests: {passed}/{total} passed ({passed/total*100:.1f}%)")
+    print_detection_summary(json_results)
     print(f"Execution Time: {total_duration:.2f}s ({total_duration/60:.2f} minutes)")
     print()
     print(f"Results saved to: {results_dir}")
@@ -14,6 +14,9 @@ import os
 from google.cloud import vision
 import json
 
+# Object names the Vision API uses for people/pedestrians (lowercase)
+PERSON_NAMES = frozenset({'person', 'people', 'pedestrian'})
+
 def find_image_path(test_id, base_path='People_Tests'):
     """Find image file with various extensions."""
     extensions = ['.jpg', '.jpeg', '.png']
@@ -91,7 +94,7 @@ def show_raw_api_response(test_id):
     # Filter to people only
     people_objects = [
         obj for obj in response.localized_object_annotations
-        if obj.name.lower() in ['person', 'people', 'pedestrian']
+        if obj.name.lower() in PERSON_NAMES
     ]
 
     print("\n" + "=" * 80)
@@ -108,7 +111,7 @@ def show_raw_api_response(test_id):
     # Show non-people objects if any
     non_people = [
         obj for obj in response.localized_object_annotations
-        if obj.name.lower() not in ['person', 'people', 'pedestrian']
+        if obj.name.lower() not in PERSON_NAMES
     ]
 
     if non_people:
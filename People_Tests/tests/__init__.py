@@ -0,0 +1,6 @@
+"""
+People detection test packages (conventional_tests, ai_tests).
+
+Each test script adds the People_Tests folder to sys.path itself, so it can
+be run directly, e.g. `python3 tests/conventional_tests/EP-004.py`.
+"""
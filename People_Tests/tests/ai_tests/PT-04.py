@@ -9,17 +9,19 @@ import sys
 import os
 import time
 
-# Add parent directory to path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+# People_Tests folder, resolved once; added to the path so `tests` imports work
+BASE_PATH = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(BASE_PATH)
 
-from google.cloud import vision
+from tests.vision_utils import localize_image
 from tests.ai_tests.test_utils import (
     draw_bounding_boxes,
     find_image_path,
     filter_people,
     create_json_output,
     save_json_output,
-    setup_output_directory
+    setup_output_directory,
+    fmt_ts
 )
 
 
@@ -33,10 +35,10 @@ def test_pt_04():
 
     # Record start time
     start_time = time.time()
-    start_time_formatted = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(start_time))
+    start_clock = time.perf_counter_ns()
 
     # Set up paths
-    base_path = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    base_path = BASE_PATH
     images_dir = os.path.join(base_path, 'images', 'ai_tests')
 
     actual_image_path = find_image_path(images_dir, TEST_ID)
@@ -45,16 +47,9 @@ def test_pt_04():
         print(f"ERROR: Image file not found for {TEST_ID}")
         return False
 
-    # Initialize Google Vision API client
-    client = vision.ImageAnnotatorClient()
-
-    # Read the image file
-    with open(actual_image_path, 'rb') as image_file:
-        content = image_file.read()
-    image = vision.Image(content=content)
-
-    # Perform object localization
-    objects = client.object_localization(image=image).localized_object_annotations
+    # Perform object localization (served from the response cache while the
+    # image is unchanged)
+    objects = localize_image(actual_image_path)
 
     # Filter for people/pedestrians
     people_detected = filter_people(objects)
@@ -72,9 +67,9 @@ def test_pt_04():
     draw_bounding_boxes(actual_image_path, people_detected, output_path)
 
     # Record end time
-    end_time = time.time()
-    end_time_formatted = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(end_time))
-    duration = end_time - start_time
+    duration = (time.perf_counter_ns() - start_clock) / 1e9
+    start_time_formatted = fmt_ts(start_time)
+    end_time_formatted = fmt_ts(time.time())
 
     timing_info = {
         'start_time': start_time_formatted,
@@ -32,10 +32,11 @@ import sys
 import os
 import time
 
-# Add parent directory to path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+# People_Tests folder, resolved once; added to the path so `tests` imports work
+BASE_PATH = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(BASE_PATH)
 
-from google.cloud import vision
+from tests.vision_utils import localize_image
 from tests.conventional_tests.test_utils import (
     draw_bounding_boxes,
     find_image_path,
@@ -44,8 +45,7 @@ from tests.conventional_tests.test_utils import (
     create_json_output,
     save_json_output,
     setup_output_directory,
-    format_duration,
-    TeeOutput
+    fmt_ts
 )
 
 
@@ -59,10 +59,10 @@ def test_bva_006():
 
     # Record start time
     start_time = time.time()
-    start_time_formatted = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(start_time))
+    start_clock = time.perf_counter_ns()
 
     # Set up the image path
-    base_path = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    base_path = BASE_PATH
     images_dir = os.path.join(base_path, 'images', 'conventional_tests')
 
     actual_image_path = find_image_path(images_dir, TEST_ID)
@@ -71,16 +71,9 @@ def test_bva_006():
         print(f"ERROR: Image file not found. Expected at: {os.path.join(images_dir, TEST_ID)}[.jpg/.jpeg/.png/.gif/.bmp]")
         return False
 
-    # Initialize Google Vision API client
-    client = vision.ImageAnnotatorClient()
-
-    # Read the image file
-    with open(actual_image_path, 'rb') as image_file:
-        content = image_file.read()
-    image = vision.Image(content=content)
-
-    # Perform object localization
-    objects = client.object_localization(image=image).localized_object_annotations
+    # Perform object localization (served from the response cache while the
+    # image is unchanged)
+    objects = localize_image(actual_image_path)
 
     # Filter for people/pedestrians
     people_detected = filter_people(objects)
@@ -131,11 +124,7 @@ def test_bva_006():
             'occlusion_level': 'None (100% visible)',
             'group_size': 'Small Group (5 people)'
         },
-        'expected_results': {
-            'actual_people_in_scene': 5,
-            'detection_rate_threshold': 85,
-            'count_tolerance': metrics['count_tolerance']
-        },
+        'detection_threshold': 85,
         'comparison': {
             'detection_rate_met': metrics['detection_rate'] >= 85,
             'count_within_tolerance': metrics['count_within_tolerance'],
@@ -179,9 +168,9 @@ def test_bva_006():
 
 
     # Record end time and calculate duration
-    end_time = time.time()
-    end_time_formatted = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(end_time))
-    duration = end_time - start_time
+    duration = (time.perf_counter_ns() - start_clock) / 1e9
+    start_time_formatted = fmt_ts(start_time)
+    end_time_formatted = fmt_ts(time.time())
 
     # Create timing info dictionary
     timing_info = {
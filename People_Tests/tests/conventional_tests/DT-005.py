@@ -24,7 +24,12 @@ Pass/Fail: [Determined by comparing actual vs expected results using functional
 import os
 import sys
 import time
-from google.cloud import vision
+
+# People_Tests folder, resolved once; added to the path so `tests` imports work
+BASE_PATH = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(BASE_PATH)
+
+from tests.vision_utils import localize_image
 from test_utils import (
     draw_bounding_boxes,
     find_image_path,
@@ -33,8 +38,7 @@ from test_utils import (
     create_json_output,
     save_json_output,
     setup_output_directory,
-    format_duration,
-    TeeOutput
+    fmt_ts
 )
 
 def test_dt_005():
@@ -45,7 +49,7 @@ def test_dt_005():
 
     # Record start time
     start_time = time.time()
-    start_time_formatted = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(start_time))
+    start_clock = time.perf_counter_ns()
 
     # Test configuration
     test_id = "DT-005"
@@ -83,17 +87,9 @@ def test_dt_005():
         save_json_output(error_json, json_output_path)
         return
 
-    # Initialize Vision API client
-    client = vision.ImageAnnotatorClient()
-
-    # Load image
-    with open(actual_image_path, 'rb') as image_file:
-        content = image_file.read()
-
-    image = vision.Image(content=content)
-
-    # Perform object localization
-    objects = client.object_localization(image=image).localized_object_annotations
+    # Perform object localization (served from the response cache while the
+    # image is unchanged)
+    objects = localize_image(actual_image_path)
 
     # Filter for people only
     people_detected = filter_people(objects)
@@ -153,9 +149,9 @@ def test_dt_005():
     }
 
     # Record end time and calculate duration
-    end_time = time.time()
-    end_time_formatted = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(end_time))
-    duration = end_time - start_time
+    duration = (time.perf_counter_ns() - start_clock) / 1e9
+    start_time_formatted = fmt_ts(start_time)
+    end_time_formatted = fmt_ts(time.time())
 
     # Create timing info dictionary
     timing_info = {
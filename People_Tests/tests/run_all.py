@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Batched Test Driver for People Detection Tests
+
+This script:
+1. Reads every registered test image once, on a thread pool
+2. Sends them to the Vision API in batched requests (up to 16 images each)
+3. Runs each test's pass/fail logic on its pre-fetched annotations as soon as
+   its batch returns, with the independent tests dispatched concurrently on a
+   thread pool while the next batch is in flight
+
+Run from the People_Tests folder:
+    python3 -m tests.run_all [--no-cache] [--no-render] [--mosaic]
+
+API responses are cached in results/.vision_cache keyed by image content, so
+reruns on unchanged images skip the API; --no-cache forces fresh requests.
+"""
+
+import os
+import time
+import argparse
+import importlib
+from concurrent.futures import ThreadPoolExecutor
+
+from tests.conventional_tests.test_utils import find_image_path, wait_for_renders
+from tests.vision_utils import iter_batches, run_mosaic
+
+
+BASE_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Tests are network/disk bound, so threads overlap well (bounded by API quota)
+MAX_WORKERS = 8
+
+# (test id, images subfolder, test module, test function)
+TESTS = [
+    ('BVA-003', 'conventional_tests', 'tests.conventional_tests.BVA-003', 'test_bva_003'),
+    ('BVA-018', 'conventional_tests', 'tests.conventional_tests.BVA-018', 'test_bva_018'),
+    ('BVA-020', 'conventional_tests', 'tests.conventional_tests.BVA-020', 'test_bva_020'),
+    ('DT-001', 'conventional_tests', 'tests.conventional_tests.DT-001', 'test_dt_001'),
+    ('EP-001', 'conventional_tests', 'tests.conventional_tests.EP-001', 'test_ep_001'),
+    ('EP-002', 'conventional_tests', 'tests.conventional_tests.EP-002', 'test_ep_002'),
+    ('EP-003', 'conventional_tests', 'tests.conventional_tests.EP-003', 'test_ep_003'),
+    ('EP-004', 'conventional_tests', 'tests.conventional_tests.EP-004', 'test_ep_004'),
+    ('EP-005', 'conventional_tests', 'tests.conventional_tests.EP-005', 'test_ep_005'),
+    ('EP-006', 'conventional_tests', 'tests.conventional_tests.EP-006', 'test_ep_006'),
+    ('EP-008', 'conventional_tests', 'tests.conventional_tests.EP-008', 'test_ep_008'),
+    ('EP-009', 'conventional_tests', 'tests.conventional_tests.EP-009', 'test_ep_009'),
+    ('EP-010', 'conventional_tests', 'tests.conventional_tests.EP-010', 'test_ep_010'),
+    ('EP-011', 'conventional_tests', 'tests.conventional_tests.EP-011', 'test_ep_011'),
+    ('PT-15', 'ai_tests', 'tests.ai_tests.PT-15', 'test_pt_15'),
+]
+
+
+def collect_test_specs():
+    """Find the input image for every registered test"""
+    test_specs = []
+    for test_id, subfolder, _, _ in TESTS:
+        images_dir = os.path.join(BASE_PATH, 'images', subfolder)
+        image_path = find_image_path(images_dir, test_id)
+        if image_path:
+            test_specs.append((test_id, image_path))
+    return test_specs
+
+
+def run_tests(annotation_batches):
+    """
+    Run every registered test as soon as its annotations are available.
+
+    Tests are dispatched to a thread pool batch by batch, so rendering and
+    JSON output for one batch overlap with the API request for the next.
+
+    Args:
+        annotation_batches: Iterable of dicts mapping test_id to
+            localized_object_annotations; tests missing from all of them
+            call the API themselves
+
+    Returns:
+        dict: Mapping of test_id to whether the test passed
+    """
+    # Import every test module up front so worker threads never race on imports
+    test_functions = {
+        test_id: getattr(importlib.import_module(module_name), function_name)
+        for test_id, _, module_name, function_name in TESTS
+    }
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = {}
+        for annotations in annotation_batches:
+            for test_id, objects in annotations.items():
+                futures[test_id] = executor.submit(test_functions[test_id], objects=objects)
+
+        for test_id, test_function in test_functions.items():
+            if test_id not in futures:
+                futures[test_id] = executor.submit(test_function)
+
+        results = {test_id: future.result() for test_id, future in futures.items()}
+
+    # Result images are drawn in the background; make sure they are on disk
+    wait_for_renders()
+    return results
+
+
+def print_summary(results, total_duration):
+    """Print the pass count and total execution time"""
+    print("=" * 80)
+    passed = sum(1 for passed in results.values() if passed)
+    print(f"Tests: {passed}/{len(results)} passed")
+    print(f"Execution Time: {total_duration:.2f}s")
+    print("=" * 80)
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Run the batched People detection tests")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="ignore cached Vision API responses and refresh them")
+    parser.add_argument('--no-render', action='store_true',
+                        help="skip writing annotated result images (same as RENDER=0)")
+    parser.add_argument('--mosaic', action='store_true',
+                        help="pack several images into each request (fewer API calls, "
+                             "lower accuracy; for smoke runs only)")
+    args = parser.parse_args()
+
+    if args.no_render:
+        os.environ['RENDER'] = '0'
+
+    start_time = time.time()
+
+    test_specs = collect_test_specs()
+    print(f"Annotating {len(test_specs)} images in batched Vision API requests...")
+    if args.mosaic:
+        annotation_batches = [run_mosaic(test_specs)]
+    else:
+        annotation_batches = iter_batches(test_specs, use_cache=not args.no_cache)
+
+    results = run_tests(annotation_batches)
+
+    print_summary(results, time.time() - start_time)
+
+
+if __name__ == "__main__":
+    main()
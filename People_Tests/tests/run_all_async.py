@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Async Test Driver for People Detection Tests
+
+Same as tests/run_all.py, except that the Vision API requests are issued as
+concurrent RPCs on the asyncio client (one request per image, all in flight
+at once over a single gRPC channel) instead of as batched requests.
+
+Run from the People_Tests folder:
+    python3 -m tests.run_all_async [--no-cache] [--no-render]
+"""
+
+import os
+import time
+import asyncio
+import argparse
+
+from tests.run_all import collect_test_specs, run_tests, print_summary
+from tests.vision_utils import run_async
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Run the People detection tests with async Vision API calls")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="ignore cached Vision API responses and refresh them")
+    parser.add_argument('--no-render', action='store_true',
+                        help="skip writing annotated result images (same as RENDER=0)")
+    args = parser.parse_args()
+
+    if args.no_render:
+        os.environ['RENDER'] = '0'
+
+    start_time = time.time()
+
+    test_specs = collect_test_specs()
+    print(f"Annotating {len(test_specs)} images with concurrent async Vision API requests...")
+    annotations = asyncio.run(run_async(test_specs, use_cache=not args.no_cache))
+
+    results = run_tests([annotations])
+
+    print_summary(results, time.time() - start_time)
+
+
+if __name__ == "__main__":
+    main()
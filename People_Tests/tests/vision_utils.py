@@ -0,0 +1,643 @@
+"""
+Shared Google Cloud Vision API helpers for People Detection Tests
+
+This module contains the API plumbing shared by the conventional and AI
+test suites including:
+- A shared Vision API client on a keepalive gRPC channel
+- Downscaling images before upload
+- Optional Google Cloud Storage staging of images (VISION_TEST_BUCKET)
+- On-disk caching of API responses keyed by image content hash, found by
+  file path, mtime and size for unchanged images
+- Batched object localization requests
+- Concurrent object localization with the asyncio client
+- Optional mosaic packing of several images into one request
+"""
+
+import os
+import math
+import mmap
+import asyncio
+import hashlib
+import tempfile
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from PIL import Image
+from google.api_core import exceptions as api_exceptions
+from google.api_core import retry as api_retry
+from google.api_core import retry_async
+from google.cloud import vision
+
+
+# Vision API limit on images per batch_annotate_images request
+MAX_BATCH_SIZE = 16
+
+# Per-attempt RPC timeouts (seconds); a batch carries up to 16 images
+REQUEST_TIMEOUT = 10.0
+BATCH_TIMEOUT = 30.0
+
+# Retry transient API errors with exponential backoff, giving up after 20s
+# (60s for batches) so one stalled call cannot hang the whole run
+REQUEST_RETRY = api_retry.Retry(initial=0.5, maximum=4.0, multiplier=2.0, deadline=20.0)
+BATCH_RETRY = api_retry.Retry(initial=0.5, maximum=4.0, multiplier=2.0, deadline=60.0)
+ASYNC_REQUEST_RETRY = retry_async.AsyncRetry(initial=0.5, maximum=4.0, multiplier=2.0, deadline=20.0)
+
+# gRPC channel options: keep the HTTP/2 connection warm between calls with
+# keepalive pings, and lift the 4MB message cap as the default channel does
+GRPC_CHANNEL_OPTIONS = [
+    ('grpc.keepalive_time_ms', 30000),
+    ('grpc.keepalive_timeout_ms', 10000),
+    ('grpc.http2.max_pings_without_data', 0),
+    ('grpc.max_send_message_length', -1),
+    ('grpc.max_receive_message_length', -1),
+]
+
+# Concurrent requests allowed by run_async (keeps within API rate limits)
+MAX_IN_FLIGHT = 8
+
+# Threads used to read and downscale images before a batch is sent
+MAX_READ_WORKERS = 8
+
+# Longest image edge sent to the API; detection quality is flat above this
+MAX_UPLOAD_SIDE = 1600
+
+# Mosaic mode: images per canvas, tile size and black gap between tiles
+MOSAIC_TILES = 4
+MOSAIC_TILE_SIDE = MAX_UPLOAD_SIDE // 2
+MOSAIC_GUTTER = 16
+
+# Serialized AnnotateImageResponse files, one per distinct image content
+CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'results',
+    '.vision_cache'
+)
+
+# When set, images are uploaded once to this GCS bucket and sent by URI
+GCS_BUCKET = os.environ.get('VISION_TEST_BUCKET')
+
+
+# Background thread localize_image uses to create the client during a read
+_CLIENT_WARMUP = ThreadPoolExecutor(max_workers=1, thread_name_prefix='vision-client')
+
+
+@functools.lru_cache(maxsize=1)
+def get_vision_client():
+    """
+    Get the process-wide Vision API client.
+
+    The client (and its gRPC channel) is created on first use and shared by
+    every test, including tests running on worker threads.
+
+    Returns:
+        vision.ImageAnnotatorClient: Shared API client
+    """
+    transport = vision.ImageAnnotatorClient.get_transport_class('grpc')
+    channel = transport.create_channel(options=GRPC_CHANNEL_OPTIONS)
+    return vision.ImageAnnotatorClient(transport=transport(channel=channel))
+
+
+def prepare_image_bytes(image_path, max_side=MAX_UPLOAD_SIDE):
+    """
+    Read an image for upload, downscaling it if its longest edge exceeds max_side.
+
+    Large images are resized and re-encoded as quality-85 JPEG, which typically
+    shrinks the upload several times over. Bounding boxes are returned in
+    normalized coordinates, so results map back onto the original image.
+
+    Args:
+        image_path: Path to the input image
+        max_side: Maximum width/height in pixels of the uploaded image
+
+    Returns:
+        bytes: Image content to send to the Vision API
+    """
+    # Map the file once and let Pillow parse the header straight from the page
+    # cache; small images are then copied out without a second open/read
+    with open(image_path, 'rb') as image_file, \
+            mmap.mmap(image_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        with Image.open(mapped) as img:
+            if max(img.size) > max_side:
+                img.thumbnail((max_side, max_side), Image.Resampling.BILINEAR)
+                buffer = BytesIO()
+                img.convert('RGB').save(buffer, 'JPEG', quality=85, optimize=True)
+                return buffer.getvalue()
+
+        return mapped[:]
+
+
+def _content_key(content):
+    """Return a short hex digest identifying the given image bytes"""
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+@functools.lru_cache(maxsize=1)
+def get_storage_client():
+    """Get the process-wide Cloud Storage client (only used with GCS_BUCKET)"""
+    from google.cloud import storage
+    return storage.Client()
+
+
+def upload_to_gcs(content, bucket_name=None):
+    """
+    Upload image bytes to Cloud Storage, keyed by content hash.
+
+    The upload is skipped when an object with the same content already
+    exists, so only the first run pays for it; after that, a marker in
+    CACHE_DIR skips even the existence check.
+
+    Args:
+        content: Image bytes to stage
+        bucket_name: Target bucket (defaults to VISION_TEST_BUCKET)
+
+    Returns:
+        str: gs:// URI of the staged image
+    """
+    bucket_name = bucket_name or GCS_BUCKET
+    blob_name = f'vision_tests/{_content_key(content)}'
+    uri = f'gs://{bucket_name}/{blob_name}'
+
+    # Objects are immutable (named by content), so one successful upload or
+    # existence check is recorded locally and never repeated
+    marker_path = os.path.join(CACHE_DIR, 'gcs', hashlib.blake2b(uri.encode(), digest_size=16).hexdigest())
+    if os.path.exists(marker_path):
+        return uri
+
+    blob = get_storage_client().bucket(bucket_name).blob(blob_name)
+    if not blob.exists():
+        blob.upload_from_string(content)
+
+    os.makedirs(os.path.dirname(marker_path), exist_ok=True)
+    open(marker_path, 'w').close()
+    return uri
+
+
+def make_vision_image(content):
+    """
+    Build the vision.Image for a request.
+
+    Args:
+        content: Image bytes
+
+    Returns:
+        vision.Image: Image referencing the GCS copy when VISION_TEST_BUCKET is
+        set, otherwise carrying the bytes inline
+    """
+    if GCS_BUCKET:
+        return vision.Image(source=vision.ImageSource(image_uri=upload_to_gcs(content)))
+    return vision.Image(content=content)
+
+
+def _response_path(content_key):
+    """Return the cache file path for a content key"""
+    return os.path.join(CACHE_DIR, f'{content_key}.pb')
+
+
+def _cache_path(content):
+    """Return the cache file path for the given image bytes"""
+    return _response_path(_content_key(content))
+
+
+def _load_cached_response(cache_path):
+    """Load a cached AnnotateImageResponse, or None on a cache miss"""
+    if not os.path.exists(cache_path):
+        return None
+    with open(cache_path, 'rb') as cache_file:
+        return vision.AnnotateImageResponse.deserialize(cache_file.read())
+
+
+def _write_atomic(path, data):
+    """
+    Write bytes to a file under a temporary name, then rename it into place.
+
+    run_all_tests.py runs tests in parallel processes sharing the cache, so
+    readers must never see a partly written file.
+    """
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as tmp_file:
+            tmp_file.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def _store_cached_response(cache_path, response):
+    """Write an AnnotateImageResponse to the cache (errors are never cached)"""
+    if response.error.message:
+        return
+    _write_atomic(cache_path, vision.AnnotateImageResponse.serialize(response))
+
+
+# Content keys already known in this process, by _file_identity()
+_CONTENT_KEYS = {}
+
+
+def _file_identity(image_path):
+    """Return a (path, mtime, size, upload size) tuple that changes whenever the upload would"""
+    stat = os.stat(image_path)
+    return (os.path.abspath(image_path), stat.st_mtime_ns, stat.st_size, MAX_UPLOAD_SIDE)
+
+
+def _identity_path(identity):
+    """Return the file recording the content key for a file identity"""
+    name = hashlib.blake2b(repr(identity).encode(), digest_size=16).hexdigest()
+    return os.path.join(CACHE_DIR, 'paths', name)
+
+
+def _lookup_content_key(identity):
+    """Return the content key recorded for an unchanged file, or None"""
+    if identity in _CONTENT_KEYS:
+        return _CONTENT_KEYS[identity]
+    try:
+        with open(_identity_path(identity)) as key_file:
+            content_key = key_file.read().strip()
+    except FileNotFoundError:
+        return None
+    _CONTENT_KEYS[identity] = content_key
+    return content_key
+
+
+def _remember_content_key(identity, content_key):
+    """Record the content key of a file so unchanged reruns can skip hashing it"""
+    _CONTENT_KEYS[identity] = content_key
+    _write_atomic(_identity_path(identity), content_key.encode())
+
+
+def cached_localize(content, use_cache=True):
+    """
+    Run object localization on image bytes, reusing a cached response if present.
+
+    Args:
+        content: Raw image bytes
+        use_cache: Set to False to ignore (and refresh) any cached response
+
+    Returns:
+        list: localized_object_annotations from the Vision API response
+    """
+    cache_path = _cache_path(content)
+
+    if use_cache:
+        response = _load_cached_response(cache_path)
+        if response is not None:
+            return response.localized_object_annotations
+
+    image = make_vision_image(content)
+    response = get_vision_client().object_localization(
+        image=image, retry=REQUEST_RETRY, timeout=REQUEST_TIMEOUT
+    )
+    _store_cached_response(cache_path, response)
+
+    return response.localized_object_annotations
+
+
+def _prepare_spec(test_id, image_path, use_cache, before_read=None):
+    """
+    Read one test image and look up its cached response.
+
+    If the file is unchanged since its content key was recorded (same path,
+    mtime and size), the cached response is found without reading, resizing
+    or hashing the image at all.
+
+    Args:
+        before_read: Optional callable run just before the image has to be
+            read, i.e. once a request is likely
+
+    Returns:
+        tuple: (test_id, content, cache_path, cached AnnotateImageResponse or
+        None); content and cache_path are None when served by file identity
+    """
+    identity = _file_identity(image_path)
+
+    if use_cache:
+        content_key = _lookup_content_key(identity)
+        if content_key is not None:
+            response = _load_cached_response(_response_path(content_key))
+            if response is not None:
+                return test_id, None, None, response
+
+    if before_read is not None:
+        before_read()
+    content = prepare_image_bytes(image_path)
+    content_key = _content_key(content)
+    _remember_content_key(identity, content_key)
+
+    cache_path = _response_path(content_key)
+    response = _load_cached_response(cache_path) if use_cache else None
+    return test_id, content, cache_path, response
+
+
+def localize_image(image_path, use_cache=True):
+    """
+    Run object localization on an image file, reusing a cached response if present.
+
+    Unchanged files are matched to their cached response by path, mtime and
+    size, so a warm rerun skips both the file read and the content hash.
+
+    Args:
+        image_path: Path to the input image
+        use_cache: Set to False to ignore (and refresh) any cached response
+
+    Returns:
+        list: localized_object_annotations from the Vision API response
+    """
+    # On a file-identity miss, set up the client (credentials, gRPC channel)
+    # in the background while the image is read, downscaled and hashed
+    client_future = []
+    _, content, cache_path, response = _prepare_spec(
+        None, image_path, use_cache,
+        before_read=lambda: client_future.append(_CLIENT_WARMUP.submit(get_vision_client))
+    )
+
+    if response is None:
+        client = client_future[0].result() if client_future else get_vision_client()
+        response = client.object_localization(
+            image=make_vision_image(content), retry=REQUEST_RETRY, timeout=REQUEST_TIMEOUT
+        )
+        _store_cached_response(cache_path, response)
+
+    return response.localized_object_annotations
+
+
+def _partition_cached(prepared):
+    """
+    Split prepared test images into cache hits and images that still need the API.
+
+    Args:
+        prepared: Iterable of _prepare_spec() results
+
+    Returns:
+        tuple: (annotations dict for cache hits, list of
+        (test_id, content, cache_path) tuples still to request)
+    """
+    annotations = {}
+    pending = []
+
+    for test_id, content, cache_path, response in prepared:
+        if response is not None:
+            annotations[test_id] = response.localized_object_annotations
+        else:
+            pending.append((test_id, content, cache_path))
+
+    return annotations, pending
+
+
+def _localization_request(content):
+    """Build an object localization AnnotateImageRequest for image bytes"""
+    return vision.AnnotateImageRequest(
+        image=make_vision_image(content),
+        features=[vision.Feature(type_=vision.Feature.Type.OBJECT_LOCALIZATION)]
+    )
+
+
+def _record_response(annotations, test_id, cache_path, response):
+    """Cache a successful response and add its annotations; warn on errors"""
+    if response.error.message:
+        print(f"Warning: Vision API error for {test_id}: {response.error.message}")
+        return
+    _store_cached_response(cache_path, response)
+    annotations[test_id] = response.localized_object_annotations
+
+
+def iter_batches(test_specs, use_cache=True):
+    """
+    Run object localization for several test images, yielding results as they arrive.
+
+    Images are read and downscaled on a thread pool. Cache hits are yielded
+    first, then the results of each batched request (up to MAX_BATCH_SIZE
+    images) as soon as it returns, so callers can start processing one batch
+    while the next request is in flight.
+
+    Args:
+        test_specs: List of (test_id, image_path) tuples
+        use_cache: Set to False to ignore (and refresh) any cached responses
+
+    Yields:
+        dict: Mapping of test_id to its localized_object_annotations. Tests whose
+        image could not be annotated are left out so they can retry on their own.
+    """
+    with ThreadPoolExecutor(max_workers=MAX_READ_WORKERS + 1) as executor:
+        # Set up the client (credentials, gRPC channel) while images are read;
+        # a failure here only surfaces if a request actually has to be sent
+        client_future = executor.submit(get_vision_client)
+        prepared = executor.map(lambda spec: _prepare_spec(*spec, use_cache), test_specs)
+        annotations, pending = _partition_cached(prepared)
+
+    if annotations:
+        yield annotations
+
+    if not pending:
+        return
+
+    client = client_future.result()
+
+    while pending:
+        chunk, pending = pending[:MAX_BATCH_SIZE], pending[MAX_BATCH_SIZE:]
+        requests = [_localization_request(content) for _, content, _ in chunk]
+        # The request protobufs hold their own copy of the image bytes, so
+        # drop ours; at most one batch of images is then resident twice
+        chunk = [(test_id, cache_path) for test_id, _, cache_path in chunk]
+
+        try:
+            responses = client.batch_annotate_images(
+                requests=requests, retry=BATCH_RETRY, timeout=BATCH_TIMEOUT
+            ).responses
+        except api_exceptions.GoogleAPIError as error:
+            # Skip the whole chunk; its tests fall back to their own request
+            print(f"Warning: Vision API batch request for {len(chunk)} images failed: {error}")
+            continue
+        finally:
+            del requests
+
+        annotations = {}
+        for (test_id, cache_path), response in zip(chunk, responses):
+            _record_response(annotations, test_id, cache_path, response)
+        yield annotations
+
+
+def run_batch(test_specs, use_cache=True):
+    """
+    Run object localization for several test images in batched requests.
+
+    Images with a cached response are served from the cache; only the rest
+    are sent to the API.
+
+    Args:
+        test_specs: List of (test_id, image_path) tuples
+        use_cache: Set to False to ignore (and refresh) any cached responses
+
+    Returns:
+        dict: Mapping of test_id to its localized_object_annotations. Tests whose
+        image could not be annotated are left out so they can retry on their own.
+    """
+    annotations = {}
+    for batch in iter_batches(test_specs, use_cache):
+        annotations.update(batch)
+    return annotations
+
+
+async def run_async(test_specs, use_cache=True, max_in_flight=MAX_IN_FLIGHT):
+    """
+    Run object localization for several test images as concurrent async RPCs.
+
+    Every uncached image is sent as its own request on one asyncio client, so
+    the requests share a single gRPC channel. Image reads run on worker
+    threads to keep the event loop free.
+
+    Args:
+        test_specs: List of (test_id, image_path) tuples
+        use_cache: Set to False to ignore (and refresh) any cached responses
+        max_in_flight: Maximum number of requests outstanding at once
+
+    Returns:
+        dict: Mapping of test_id to its localized_object_annotations, as for
+        run_batch
+    """
+    prepared = await asyncio.gather(*(
+        asyncio.to_thread(_prepare_spec, test_id, image_path, use_cache)
+        for test_id, image_path in test_specs
+    ))
+    annotations, pending = _partition_cached(prepared)
+    if not pending:
+        return annotations
+
+    # The async client binds to the running event loop, so it is not shared
+    transport = vision.ImageAnnotatorAsyncClient.get_transport_class('grpc_asyncio')
+    channel = transport.create_channel(options=GRPC_CHANNEL_OPTIONS)
+    client = vision.ImageAnnotatorAsyncClient(transport=transport(channel=channel))
+    semaphore = asyncio.Semaphore(max_in_flight)
+
+    async def localize(content):
+        async with semaphore:
+            batch = await client.batch_annotate_images(
+                requests=[_localization_request(content)],
+                retry=ASYNC_REQUEST_RETRY,
+                timeout=REQUEST_TIMEOUT
+            )
+        return batch.responses[0]
+
+    responses = await asyncio.gather(
+        *(localize(content) for _, content, _ in pending), return_exceptions=True
+    )
+
+    for (test_id, _, cache_path), response in zip(pending, responses):
+        if isinstance(response, Exception):
+            print(f"Warning: Vision API request for {test_id} failed: {response}")
+            continue
+        _record_response(annotations, test_id, cache_path, response)
+
+    return annotations
+
+
+def _build_mosaic(image_paths, tile_side=MOSAIC_TILE_SIDE, gutter=MOSAIC_GUTTER):
+    """
+    Pack several images into one grid canvas separated by black gutters.
+
+    Returns:
+        tuple: (JPEG bytes of the canvas, (canvas width, canvas height),
+        list of (x, y, width, height) tile placements in image_paths order)
+    """
+    columns = math.ceil(math.sqrt(len(image_paths)))
+    rows = math.ceil(len(image_paths) / columns)
+    step = tile_side + gutter
+    canvas = Image.new('RGB', (columns * step - gutter, rows * step - gutter))
+
+    placements = []
+    for index, image_path in enumerate(image_paths):
+        with Image.open(image_path) as img:
+            tile = img.convert('RGB')
+            tile.thumbnail((tile_side, tile_side), Image.Resampling.BILINEAR)
+        x, y = (index % columns) * step, (index // columns) * step
+        canvas.paste(tile, (x, y))
+        placements.append((x, y, tile.width, tile.height))
+
+    buffer = BytesIO()
+    canvas.save(buffer, 'JPEG', quality=85, optimize=True)
+    return buffer.getvalue(), canvas.size, placements
+
+
+def _remap_to_tile(obj, canvas_size, placements):
+    """
+    Map an annotation on the mosaic back onto the tile containing its center.
+
+    Returns:
+        tuple: (tile index, LocalizedObjectAnnotation normalized to that tile),
+        or None when the box is centered in a gutter
+    """
+    canvas_width, canvas_height = canvas_size
+    xs = [vertex.x * canvas_width for vertex in obj.bounding_poly.normalized_vertices]
+    ys = [vertex.y * canvas_height for vertex in obj.bounding_poly.normalized_vertices]
+    if not xs:
+        return None
+    center_x, center_y = (min(xs) + max(xs)) / 2, (min(ys) + max(ys)) / 2
+
+    for index, (x, y, width, height) in enumerate(placements):
+        if x <= center_x < x + width and y <= center_y < y + height:
+            vertices = [
+                vision.NormalizedVertex(
+                    x=min(max((px - x) / width, 0.0), 1.0),
+                    y=min(max((py - y) / height, 0.0), 1.0)
+                )
+                for px, py in zip(xs, ys)
+            ]
+            return index, vision.LocalizedObjectAnnotation(
+                mid=obj.mid,
+                name=obj.name,
+                score=obj.score,
+                bounding_poly=vision.BoundingPoly(normalized_vertices=vertices)
+            )
+
+    return None
+
+
+def run_mosaic(test_specs, tiles_per_request=MOSAIC_TILES):
+    """
+    Run object localization with several test images packed onto each request.
+
+    Each group of images is tiled onto one canvas and sent as a single image,
+    cutting API calls by up to tiles_per_request. Detections are mapped back
+    to the image they fall in. Images are shrunk to fit a tile, so small or
+    distant people may be missed; use this for quick smoke runs, not for
+    reportable results. Responses are not cached.
+
+    Args:
+        test_specs: List of (test_id, image_path) tuples
+        tiles_per_request: Number of images packed into each canvas
+
+    Returns:
+        dict: Mapping of test_id to its localized_object_annotations. Tests in a
+        failed request are left out so they can retry on their own.
+    """
+    annotations = {}
+    client = get_vision_client()
+
+    for start in range(0, len(test_specs), tiles_per_request):
+        chunk = test_specs[start:start + tiles_per_request]
+        content, canvas_size, placements = _build_mosaic([image_path for _, image_path in chunk])
+
+        try:
+            response = client.object_localization(
+                image=make_vision_image(content), retry=REQUEST_RETRY, timeout=REQUEST_TIMEOUT
+            )
+        except api_exceptions.GoogleAPIError as error:
+            print(f"Warning: Vision API request for mosaic of {len(chunk)} images failed: {error}")
+            continue
+        if response.error.message:
+            print(f"Warning: Vision API error for mosaic of {len(chunk)} images: {response.error.message}")
+            continue
+
+        tile_objects = [[] for _ in chunk]
+        for obj in response.localized_object_annotations:
+            remapped = _remap_to_tile(obj, canvas_size, placements)
+            if remapped is not None:
+                index, tile_obj = remapped
+                tile_objects[index].append(tile_obj)
+
+        for (test_id, _), objects in zip(chunk, tile_objects):
+            annotations[test_id] = objects
+
+    return annotations
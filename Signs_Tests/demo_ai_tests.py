@@ -11,118 +11,276 @@ Runs all 27 AI test cases and displays for each:
 
 Usage:
     python3 demo_ai_tests.py
+    python3 demo_ai_tests.py --headless   # no figures, only write results (alias: --no-display)
+
+Runs without a display, or with HEADLESS set to anything but 0/false, are
+headless automatically.
 """
 
+import argparse
+import hashlib
 import os
+import queue
 import sys
+import tempfile
+import threading
 import time
 import json
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
+import matplotlib
+
+# Use the non-GUI Agg backend when there is nothing to show figures on (no X11
+# or Wayland display on Linux, e.g. CI or SSH) or HEADLESS is set to anything
+# but 0/false; pyplot must not be imported before this. Same check as in
+# automated_tests.py, keep the two in sync
+NO_GUI = os.environ.get('HEADLESS', '0').lower() not in ('', '0', 'false') or (
+    sys.platform.startswith('linux')
+    and not os.environ.get('DISPLAY')
+    and not os.environ.get('WAYLAND_DISPLAY')
+)
+if NO_GUI:
+    matplotlib.use('Agg')
 import matplotlib.pyplot as plt
-import matplotlib.image as mpimg
 import matplotlib.patches as patches
+import numpy as np
 from PIL import Image
 
+# orjson parses much faster than the stdlib decoder; fall back to json without it
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# PyTurboJPEG decodes JPEGs with libjpeg-turbo's SIMD code; fall back to Pillow
+# when the package or the shared library is missing
+try:
+    from turbojpeg import TurboJPEG, TJPF_RGB
+    _TURBO = TurboJPEG()
+except (ImportError, OSError, RuntimeError):
+    _TURBO = None
+
 # Add paths for imports
 script_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, script_dir)
 
+import grpc
+from google.api_core import exceptions as api_exceptions
 from google.cloud import vision
 from tests.ai_tests.test_utils import (
-    draw_bounding_boxes,
+    render_result_image,
+    sign_boxes,
     find_image_path,
-    filter_signs,
+    is_sign_name,
     create_json_output,
     save_json_output,
     setup_output_directory
 )
 
 
+def read_image_bytes(image_path):
+    """
+    Read a whole image file in one unbuffered read.
+
+    An unbuffered FileIO sizes its read from the file's stat, so the bytes
+    are read straight into the result without going through a
+    BufferedReader's buffer.
+
+    Args:
+        image_path: Path to the image
+
+    Returns:
+        bytes: File contents
+    """
+    with open(image_path, 'rb', buffering=0) as f:
+        return f.read()
+
+
+def read_image(image_path):
+    """
+    Decode an image file into an RGB(A) array for display.
+
+    Args:
+        image_path: Path to the image
+
+    Returns:
+        numpy.ndarray: Array of shape (height, width, channels)
+    """
+    if _TURBO is not None and image_path.lower().endswith(('.jpg', '.jpeg')):
+        return _TURBO.decode(read_image_bytes(image_path), pixel_format=TJPF_RGB)
+    return np.asarray(Image.open(image_path))
+
+
+def prefetch_input_images(image_paths, depth=None):
+    """
+    Decode images for display on a background thread, ahead of their use.
+
+    Args:
+        image_paths: Paths of the images, in the order they will be shown
+        depth: How many decoded images may wait in the queue
+            (default PREFETCH_DEPTH)
+
+    Returns:
+        queue.Queue: One read_image() array per path, in order; None where
+        decoding failed, so the caller can decode again and see the error
+    """
+    images = queue.Queue(maxsize=depth or PREFETCH_DEPTH)
+
+    def produce():
+        for image_path in image_paths:
+            try:
+                image = read_image(image_path)
+            except Exception:
+                image = None
+            images.put(image)
+
+    threading.Thread(target=produce, name='prefetch-images', daemon=True).start()
+    return images
+
+
 def load_expected_localizations():
     """Load expected bounding box localizations from JSON file"""
     json_path = os.path.join(script_dir, 'expected_localizations.json')
     if os.path.exists(json_path):
+        if orjson is not None:
+            with open(json_path, 'rb') as f:
+                return orjson.loads(f.read())
         with open(json_path, 'r') as f:
             return json.load(f)
     return None
 
 
-def calculate_iou(box1, box2):
-    """
-    Calculate Intersection over Union (IoU) between two bounding boxes.
-    Boxes are in format: {'x_min': float, 'y_min': float, 'x_max': float, 'y_max': float}
-    Returns IoU score between 0 and 1.
+def index_expected_boxes(expected_localizations):
     """
-    # Calculate intersection
-    x_left = max(box1['x_min'], box2['x_min'])
-    y_top = max(box1['y_min'], box2['y_min'])
-    x_right = min(box1['x_max'], box2['x_max'])
-    y_bottom = min(box1['y_max'], box2['y_max'])
+    Map each test ID to its expected boxes, once per run.
 
-    if x_right < x_left or y_bottom < y_top:
-        return 0.0
+    Args:
+        expected_localizations: Output of load_expected_localizations()
+
+    Returns:
+        dict: test_id -> list of localizations, for tests that have any
+    """
+    if not expected_localizations or 'test_cases' not in expected_localizations:
+        return {}
+    return {
+        test_id: test_data['localizations']
+        for test_id, test_data in expected_localizations['test_cases'].items()
+        if test_data and test_data.get('localizations')
+    }
 
-    intersection_area = (x_right - x_left) * (y_bottom - y_top)
 
-    # Calculate union
-    box1_area = (box1['x_max'] - box1['x_min']) * (box1['y_max'] - box1['y_min'])
-    box2_area = (box2['x_max'] - box2['x_min']) * (box2['y_max'] - box2['y_min'])
-    union_area = box1_area + box2_area - intersection_area
+# Order of the coordinates in the box arrays iou_matrix() works on
+BOX_KEYS = ('x_min', 'y_min', 'x_max', 'y_max')
 
-    if union_area == 0:
-        return 0.0
 
-    return intersection_area / union_area
+def expected_box_arrays(expected_boxes_by_test):
+    """
+    Convert each test's expected boxes to an array, once per run.
 
+    Args:
+        expected_boxes_by_test: Output of index_expected_boxes()
 
-def convert_detected_to_box(detected_obj):
-    """Convert a detected object's bounding poly to our box format"""
-    vertices = detected_obj.bounding_poly.normalized_vertices
-    x_coords = [v.x for v in vertices]
-    y_coords = [v.y for v in vertices]
+    Returns:
+        dict: test_id -> (N, 4) float array of [x_min, y_min, x_max, y_max]
+    """
     return {
-        'x_min': min(x_coords),
-        'y_min': min(y_coords),
-        'x_max': max(x_coords),
-        'y_max': max(y_coords)
+        test_id: np.array([[box['bounding_box'][k] for k in BOX_KEYS] for box in boxes], dtype=np.float64)
+        for test_id, boxes in expected_boxes_by_test.items()
     }
 
 
-def calculate_localization_score(expected_boxes, detected_objects, iou_threshold=0.3):
+def iou_matrix(expected, detected):
+    """
+    Calculate the Intersection over Union (IoU) of every expected box with every detected box.
+
+    Args:
+        expected: (N, 4) array of [x_min, y_min, x_max, y_max] boxes
+        detected: (M, 4) array of boxes in the same format
+
+    Returns:
+        numpy.ndarray: (N, M) IoU scores between 0 and 1
+    """
+    # Calculate intersections, broadcasting expected rows against detected columns
+    x_left = np.maximum(expected[:, None, 0], detected[None, :, 0])
+    y_top = np.maximum(expected[:, None, 1], detected[None, :, 1])
+    x_right = np.minimum(expected[:, None, 2], detected[None, :, 2])
+    y_bottom = np.minimum(expected[:, None, 3], detected[None, :, 3])
+    intersection = np.clip(x_right - x_left, 0, None) * np.clip(y_bottom - y_top, 0, None)
+
+    # Calculate unions
+    expected_area = (expected[:, 2] - expected[:, 0]) * (expected[:, 3] - expected[:, 1])
+    detected_area = (detected[:, 2] - detected[:, 0]) * (detected[:, 3] - detected[:, 1])
+    union = expected_area[:, None] + detected_area[None, :] - intersection
+
+    return np.divide(intersection, union, out=np.zeros_like(intersection), where=union > 0)
+
+
+def detected_box_array(detected_objects):
+    """
+    Convert detected (name, score, vertices) tuples from sign_boxes() to a box array.
+
+    The Vision API returns four normalized vertices per bounding poly, so all
+    polygons are stacked into one (M, 4, 2) array and reduced in one step.
+
+    Returns:
+        numpy.ndarray: (M, 4) array of [x_min, y_min, x_max, y_max]
+    """
+    corners = np.array([vertices for _, _, vertices in detected_objects], dtype=np.float64)
+    return np.concatenate([corners.min(axis=1), corners.max(axis=1)], axis=1)
+
+
+def calculate_localization_score(expected, detected_objects, iou_threshold=0.3, min_score=0.3):
     """
     Calculate localization accuracy using IoU matching.
+    expected is a test's (N, 4) array from expected_box_arrays();
+    detected_objects are (name, score, vertices) tuples from sign_boxes().
+    Detections scoring below min_score are left out of the matching.
     Returns: (matched_count, avg_iou, details)
     """
-    if not expected_boxes or not detected_objects:
-        if not expected_boxes and not detected_objects:
-            return 0, 1.0, []  # Both empty = perfect match
-        return 0, 0.0, []
+    # Both empty = perfect match; low-confidence detections on an image with
+    # no expected signs are still false positives
+    if not len(expected) and not detected_objects:
+        return 0, 1.0, []
 
-    # Convert detected objects to box format
-    detected_boxes = [convert_detected_to_box(obj) for obj in detected_objects]
+    # Keep confident detections, most confident first; order maps back to
+    # the original positions for the detected ids
+    order = sorted(range(len(detected_objects)), key=lambda j: -detected_objects[j][1])
+    order = [j for j in order if detected_objects[j][1] >= min_score]
 
-    # Greedy matching: for each expected box, find best matching detected box
-    matched_ious = []
-    used_detected = set()
-    details = []
+    if not len(expected) or not order:
+        return 0, 0.0, []
 
-    for i, exp_box in enumerate(expected_boxes):
-        best_iou = 0.0
-        best_idx = -1
+    # Convert the detections to a box array and score every pair at once
+    detected = detected_box_array([detected_objects[j] for j in order])
+    ious = iou_matrix(expected, detected)
+
+    # Detection-first matching: each detection, in descending score order,
+    # takes its best-overlapping expected box that is still unmatched
+    remaining = ious.copy()
+    matches = {}
+    for j in range(len(detected)):
+        i = int(remaining[:, j].argmax())
+        best_iou = float(remaining[i, j])
+        if best_iou <= 0.0 or best_iou < iou_threshold:
+            continue
+        matches[i] = (j, best_iou)
+        remaining[i, :] = -1.0
 
-        for j, det_box in enumerate(detected_boxes):
-            if j in used_detected:
-                continue
-            iou = calculate_iou(exp_box['bounding_box'], det_box)
-            if iou > best_iou:
-                best_iou = iou
-                best_idx = j
+    used_detected = np.zeros(len(detected), dtype=bool)
+    used_detected[[j for j, _ in matches.values()]] = True
 
-        if best_idx >= 0 and best_iou >= iou_threshold:
-            used_detected.add(best_idx)
+    matched_ious = []
+    details = []
+    for i in range(len(expected)):
+        if i in matches:
+            best_idx, best_iou = matches[i]
             matched_ious.append(best_iou)
-            details.append({'expected_id': i+1, 'detected_id': best_idx+1, 'iou': best_iou, 'matched': True})
+            details.append({'expected_id': i+1, 'detected_id': order[best_idx]+1, 'iou': best_iou, 'matched': True})
         else:
+            # Report the best overlap left among unmatched detections
+            candidates = ious[i][~used_detected]
+            best_iou = float(candidates.max()) if candidates.size else 0.0
             details.append({'expected_id': i+1, 'detected_id': None, 'iou': best_iou, 'matched': False})
 
     matched_count = len(matched_ious)
@@ -131,6 +289,216 @@ def calculate_localization_score(expected_boxes, detected_objects, iou_threshold
     return matched_count, avg_iou, details
 
 
+def call_vision(client, image_path):
+    """
+    Send one image to the Vision API for object localization.
+
+    Args:
+        client: vision.ImageAnnotatorClient
+        image_path: Path to the input image
+
+    Returns:
+        The response's localized_object_annotations, or None if the request
+        failed (the error is printed)
+    """
+    image = vision.Image(content=read_image_bytes(image_path))
+    try:
+        response = client.object_localization(image=image)
+    except api_exceptions.GoogleAPIError as error:
+        print(f"  Warning: Vision API request for {image_path} failed: {error}")
+        return None
+    if response.error.message:
+        print(f"  Warning: Vision API error for {image_path}: {response.error.message}")
+        return None
+    return response.localized_object_annotations
+
+
+def response_cache_path(cache_dir, image_path):
+    """
+    Get the cache file for an image's Vision API response.
+
+    Keyed by a blake2b digest of the image bytes, the same scheme as
+    People_Tests/tests/vision_utils.py, so editing or replacing an image
+    makes its old response unreachable while renaming or touching it does not.
+
+    Args:
+        cache_dir: Directory holding cached responses
+        image_path: Path to the input image
+
+    Returns:
+        str: Path of the (possibly not yet written) cache file
+    """
+    key = hashlib.blake2b(read_image_bytes(image_path), digest_size=16).hexdigest()
+    return os.path.join(cache_dir, f'{key}.pb')
+
+
+def load_cached_objects(cache_path):
+    """
+    Load the localized objects of a cached response.
+
+    Args:
+        cache_path: Path from response_cache_path()
+
+    Returns:
+        localized_object_annotations, or None when nothing is cached
+    """
+    if not os.path.exists(cache_path):
+        return None
+    response = vision.AnnotateImageResponse.deserialize(read_image_bytes(cache_path))
+    return response.localized_object_annotations
+
+
+def write_atomic(path, data):
+    """
+    Write bytes to a file under a temporary name, then rename it into place.
+
+    An interrupted run never leaves a truncated response that every later
+    run would fail to parse.
+
+    Args:
+        path: Destination file
+        data: Bytes to write
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as tmp_file:
+            tmp_file.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def result_image_is_current(output_image_path, *sources):
+    """
+    Check that a result image from an earlier run can be reused.
+
+    It must exist and be newer than everything it was drawn from: the input
+    image, the cached response, and the module holding the renderer (so a
+    change to the drawing code redraws every image).
+
+    Args:
+        output_image_path: Path of the result image
+        *sources: Paths the image depends on
+
+    Returns:
+        bool: True if the image is up to date
+    """
+    try:
+        rendered = os.stat(output_image_path).st_mtime_ns
+        return all(os.stat(source).st_mtime_ns <= rendered
+                   for source in (*sources, RENDER_SOURCE))
+    except OSError:
+        return False
+
+
+def call_vision_batch(client, image_paths, cache_paths=None):
+    """
+    Send up to MAX_BATCH_SIZE images to the Vision API in one request.
+
+    Safe to run on worker threads: it only reads the files and makes the
+    network call, leaving all plotting to the main thread.
+
+    Args:
+        client: vision.ImageAnnotatorClient (shared between threads)
+        image_paths: Paths of the input images
+        cache_paths: Optional response_cache_path() per image; successful
+            responses are written there
+
+    Returns:
+        list: localized_object_annotations for each image, in input order;
+        None for an image whose request failed, so it can be retried alone
+    """
+    requests = []
+    for image_path in image_paths:
+        requests.append(vision.AnnotateImageRequest(
+            image=vision.Image(content=read_image_bytes(image_path)),
+            features=[vision.Feature(type_=vision.Feature.Type.OBJECT_LOCALIZATION)]
+        ))
+    try:
+        response = client.batch_annotate_images(requests=requests)
+    except api_exceptions.GoogleAPIError as error:
+        print(f"Warning: Vision API batch request for {len(image_paths)} images failed: {error}")
+        return [None] * len(image_paths)
+
+    results = []
+    for image_path, cache_path, image_response in zip(
+            image_paths, cache_paths or [None] * len(image_paths), response.responses):
+        if image_response.error.message:
+            print(f"Warning: Vision API error for {image_path}: {image_response.error.message}")
+            results.append(None)
+            continue
+        if cache_path:
+            write_atomic(cache_path, vision.AnnotateImageResponse.serialize(image_response))
+        results.append(image_response.localized_object_annotations)
+    return results
+
+
+# Same channel options as People_Tests/tests/vision_utils.py (this demo runs
+# standalone and can't import it): keepalive pings between tests, no 4MB cap
+GRPC_CHANNEL_OPTIONS = [
+    ('grpc.keepalive_time_ms', 30000),
+    ('grpc.keepalive_timeout_ms', 10000),
+    ('grpc.http2.max_pings_without_data', 0),
+    ('grpc.max_send_message_length', -1),
+    ('grpc.max_receive_message_length', -1),
+]
+
+# Source file of render_result_image(); result images older than it are redrawn
+RENDER_SOURCE = render_result_image.__code__.co_filename
+
+# Seconds to wait for the channel's connection before the first test
+CONNECT_TIMEOUT = 10
+
+
+def create_vision_client():
+    """
+    Create the Vision API client and open its connection up front.
+
+    Waiting for the channel to become ready makes the DNS lookup and TLS
+    handshake happen here instead of inside the first test, without sending
+    a billable request.
+
+    Returns:
+        tuple: (vision.ImageAnnotatorClient, seconds spent connecting)
+    """
+    transport = vision.ImageAnnotatorClient.get_transport_class('grpc')
+    channel = transport.create_channel(options=GRPC_CHANNEL_OPTIONS)
+    client = vision.ImageAnnotatorClient(transport=transport(channel=channel))
+
+    start = time.perf_counter()
+    try:
+        grpc.channel_ready_future(channel).result(timeout=CONNECT_TIMEOUT)
+    except grpc.FutureTimeoutError:
+        print(f"  Warning: no connection to the Vision API after {CONNECT_TIMEOUT}s; continuing")
+    return client, time.perf_counter() - start
+
+
+# The Vision API accepts at most 16 images per batch_annotate_images request
+MAX_BATCH_SIZE = 16
+
+# Batched Vision API requests main() keeps in flight while earlier tests are displayed
+MAX_PARALLEL_REQUESTS = 8
+
+# Worker processes encoding result images (matplotlib is not thread-safe)
+MAX_RENDER_PROCESSES = 2
+
+# Decoded input images prefetch_input_images() keeps ready for display
+PREFETCH_DEPTH = 2
+
+# Seconds each figure stays on screen
+INPUT_DISPLAY_SECONDS = 2
+RESULT_DISPLAY_SECONDS = 3
+COMPARISON_DISPLAY_SECONDS = 4
+
+# Open display figures by size, see display_figure()
+_DISPLAY_FIGURES = {}
+
+# False for --headless or without a GUI (NO_GUI): the show_* functions then
+# return immediately and only the result files are written
+DISPLAY_ENABLED = not NO_GUI
+
+
 # Terminal colors
 class Colors:
     BOLD = '\033[1m'
@@ -175,11 +543,38 @@ TEST_CASES = {
 }
 
 
-def show_input_image(image_path, test_id, description, expected_count):
-    """Display the clean input image before processing (no bounding boxes)"""
-    img = Image.open(image_path)
+# Kept in sync with display_figure() in automated_tests.py
+def display_figure(figsize, ncols=1):
+    """
+    Clear and return the display figure of the given size, making it current.
+
+    Figures are kept open and reused across tests instead of creating and
+    closing a window for every show_* call; one is recreated if its window
+    was closed.
+
+    Args:
+        figsize: (width, height) in inches; one figure is kept per size
+        ncols: Number of side-by-side axes
+
+    Returns:
+        tuple: (Figure, Axes) or (Figure, array of Axes) when ncols > 1
+    """
+    fig = _DISPLAY_FIGURES.get(figsize)
+    if fig is None or not plt.fignum_exists(fig.number):
+        fig = plt.figure(figsize=figsize)
+        _DISPLAY_FIGURES[figsize] = fig
+    else:
+        plt.figure(fig.number)
+        fig.clear()
+    return fig, fig.subplots(1, ncols)
 
-    fig, ax = plt.subplots(figsize=(18, 10))  # Match input+output figure size
+
+def show_input_image(img, test_id, description, expected_count):
+    """Display the clean input image (a read_image() array) before processing (no bounding boxes)"""
+    if not DISPLAY_ENABLED:
+        return
+
+    fig, ax = display_figure((18, 10))  # Same window as the before/after comparison
     ax.imshow(img)
 
     ax.set_title(f"Input: {test_id}\n{description}\nExpected: {expected_count} signs/stoplights", fontsize=10, fontweight='bold')
@@ -189,14 +584,16 @@ def show_input_image(image_path, test_id, description, expected_count):
     plt.subplots_adjust(top=0.90)
     plt.tight_layout(rect=[0, 0, 1, 0.90])
     plt.show(block=False)
-    plt.pause(2)  # Show for 2 seconds
-    plt.close()
+    plt.pause(INPUT_DISPLAY_SECONDS)
 
 
 def show_result_image(output_image_path, test_id, expected, detected, passed):
     """Display the result image with bounding boxes"""
-    img = mpimg.imread(output_image_path)
-    fig, ax = plt.subplots(figsize=(12, 8))
+    if not DISPLAY_ENABLED:
+        return
+
+    img = read_image(output_image_path)
+    fig, ax = display_figure((12, 8))
     ax.imshow(img)
 
     status = "PASS" if passed else "FAIL"
@@ -206,37 +603,42 @@ def show_result_image(output_image_path, test_id, expected, detected, passed):
     ax.axis('off')
     plt.tight_layout()
     plt.show(block=False)
-    plt.pause(3)  # Show for 3 seconds
-    plt.close()
+    plt.pause(RESULT_DISPLAY_SECONDS)
+
 
+def show_before_after(img_input, output_image_path, test_id, description, expected, detected, count_passed, loc_info=None, expected_boxes=None,
+                      expected_array=None):
+    """
+    Display input (with expected blue boxes) and output (with detected red boxes) images side by side
+
+    img_input is the input image already decoded by run_test (a read_image() array).
+    expected_array is the test's expected_box_arrays() entry for expected_boxes
+    (converted here when omitted).
+    """
+    if not DISPLAY_ENABLED:
+        return
 
-def show_before_after(input_image_path, output_image_path, test_id, description, expected, detected, count_passed, loc_info=None, expected_boxes=None):
-    """Display input (with expected blue boxes) and output (with detected red boxes) images side by side"""
-    fig, axes = plt.subplots(1, 2, figsize=(18, 10))
+    fig, axes = display_figure((18, 10), ncols=2)
 
     # Input image with EXPECTED boxes in blue (left)
-    img_input = Image.open(input_image_path)
-    width, height = img_input.size
+    height, width = img_input.shape[:2]
     axes[0].imshow(img_input)
 
     # Draw expected boxes on the INPUT image (left side) - matching style
     if expected_boxes:
-        for i, box_data in enumerate(expected_boxes):
-            box = box_data['bounding_box']
-            # Convert normalized coordinates to pixel coordinates for polygon
-            coords = [
-                (box['x_min'] * width, box['y_min'] * height),
-                (box['x_max'] * width, box['y_min'] * height),
-                (box['x_max'] * width, box['y_max'] * height),
-                (box['x_min'] * width, box['y_max'] * height)
-            ]
-
-            poly = patches.Polygon(coords, fill=False, edgecolor='blue', linewidth=3)
-            axes[0].add_patch(poly)
+        if expected_array is None:
+            expected_array = expected_box_arrays({test_id: expected_boxes})[test_id]
+        # Convert all normalized boxes to pixel coordinates at once
+        pixel_boxes = expected_array * np.array([width, height, width, height])
+
+        for i, (box_data, (min_x, min_y, max_x, max_y)) in enumerate(zip(expected_boxes, pixel_boxes.tolist())):
+            # Expected boxes are axis-aligned, so a Rectangle (a scaled unit
+            # square) replaces the general Polygon path
+            rect = patches.Rectangle((min_x, min_y), max_x - min_x, max_y - min_y,
+                                     fill=False, edgecolor='blue', linewidth=3)
+            axes[0].add_patch(rect)
 
             # Label with blue background box (matching style)
-            min_x = box['x_min'] * width
-            min_y = box['y_min'] * height
             sign_type = box_data.get('type', 'Sign/Stoplight')
             label = f"Expected {i+1}: {sign_type}"
             axes[0].text(min_x, min_y - 10, label,
@@ -249,7 +651,7 @@ def show_before_after(input_image_path, output_image_path, test_id, description,
     axes[0].axis('off')
 
     # Output image with DETECTED boxes (red) only (right)
-    img_output = mpimg.imread(output_image_path)
+    img_output = read_image(output_image_path)
     axes[1].imshow(img_output)
 
     # Build status string
@@ -270,12 +672,34 @@ def show_before_after(input_image_path, output_image_path, test_id, description,
     plt.subplots_adjust(top=0.92)
     plt.tight_layout(rect=[0, 0, 1, 0.92])
     plt.show(block=False)
-    plt.pause(4)  # Show for 4 seconds
-    plt.close()
+    plt.pause(COMPARISON_DISPLAY_SECONDS)
+
+
+def run_test(test_id, client, images_dir, output_dir, expected_boxes=None, pending_batch=None,
+             render_pool=None, input_image=None, cached_response=None, expected_array=None):
+    """
+    Execute a single test and return results including localization verification
+
+    expected_boxes is this test's entry from index_expected_boxes(), or None
+    to skip localization verification; expected_array is the matching entry
+    from expected_box_arrays() (converted here when omitted).
+
+    pending_batch is an optional (future, index) pair from main(): the future
+    resolves to call_vision_batch() results and index is this test's position
+    in that batch. Without it, or when the batch failed for this image, the
+    API is called here; if that fails too, only {'test_id', 'error'} is
+    returned. None is returned when the image is missing.
+
+    With a render_pool, the result image is drawn in a worker process and the
+    returned 'render' future must complete before 'output_image' is read.
 
+    input_image is the already decoded input (see prefetch_input_images());
+    it is decoded here when omitted and figures are displayed.
 
-def run_test(test_id, client, images_dir, output_dir, expected_localizations=None):
-    """Execute a single test and return results including localization verification"""
+    cached_response is the response_cache_path() the detections were loaded
+    from, if any; a result image from an earlier run that is newer than it
+    (see result_image_is_current()) is kept instead of being drawn again.
+    """
     test_info = TEST_CASES.get(test_id, {'expected': 0, 'description': 'Unknown'})
     expected_count = test_info['expected']
     description = test_info['description']
@@ -288,36 +712,50 @@ def run_test(test_id, client, images_dir, output_dir, expected_localizations=Non
     if not image_path:
         return None
 
-    # Get expected bounding boxes for this test
-    expected_boxes = None
-    if expected_localizations and 'test_cases' in expected_localizations:
-        test_data = expected_localizations['test_cases'].get(test_id)
-        if test_data and test_data.get('localizations'):
-            expected_boxes = test_data['localizations']
+    # Decode the input once; both the input preview and the before/after
+    # comparison display it
+    if input_image is None and DISPLAY_ENABLED:
+        input_image = read_image(image_path)
 
     # Show input image FIRST before processing (clean, no boxes)
-    print(f"\n  Showing input image...")
-    show_input_image(image_path, test_id, description, expected_count)
-
-    # Call Vision API
-    print(f"  Calling Google Vision API...")
-    with open(image_path, 'rb') as f:
-        content = f.read()
-    image = vision.Image(content=content)
-    response = client.object_localization(image=image)
-    all_objects = response.localized_object_annotations
-
-    # Filter for signs/stoplights
-    signs_detected = filter_signs(all_objects)
+    if DISPLAY_ENABLED:
+        print(f"\n  Showing input image...")
+    show_input_image(input_image, test_id, description, expected_count)
+
+    # Call Vision API; an image whose batched request failed is sent on its own
+    all_objects = None
+    if pending_batch is not None:
+        print(f"  Waiting for Google Vision API response...")
+        batch, index = pending_batch
+        all_objects = batch.result()[index]
+        if all_objects is None:
+            print(f"  Batched request failed; calling Google Vision API for this image...")
+    else:
+        print(f"  Calling Google Vision API...")
+    if all_objects is None:
+        all_objects = call_vision(client, image_path)
+        if all_objects is None:
+            return {'test_id': test_id, 'error': "Vision API request failed"}
+
+    # Filter for signs/stoplights, classifying each name once; the flags are
+    # kept for the console report. Same test as filter_signs().
+    reported_objects = [(o.name, o.score, is_sign_name(o.name)) for o in all_objects]
+    signs_detected = [o for o, (_, _, is_sign) in zip(all_objects, reported_objects) if is_sign]
     detected_count = len(signs_detected)
 
+    # Read the protobuf fields once; localization, rendering and the report
+    # all work from these plain tuples
+    detected_boxes = sign_boxes(signs_detected)
+
     # Determine count pass/fail
     count_passed = detected_count == expected_count
 
     # Calculate localization score if expected boxes are available
     loc_info = None
     if expected_boxes is not None:
-        matched_count, avg_iou, loc_details = calculate_localization_score(expected_boxes, signs_detected)
+        if expected_array is None:
+            expected_array = expected_box_arrays({test_id: expected_boxes})[test_id]
+        matched_count, avg_iou, loc_details = calculate_localization_score(expected_array, detected_boxes)
         loc_info = {
             'matched': matched_count,
             'total': len(expected_boxes) if expected_boxes else 0,
@@ -327,7 +765,13 @@ def run_test(test_id, client, images_dir, output_dir, expected_localizations=Non
 
     # Generate output image with ONLY detected (red) boxes - using original function
     output_image_path = os.path.join(output_dir, f'{test_id}_result.jpg')
-    draw_bounding_boxes(image_path, signs_detected, output_image_path)
+    render = None
+    if cached_response and result_image_is_current(output_image_path, image_path, cached_response):
+        print(f"  Reusing result image from an earlier run")
+    elif render_pool is not None:
+        render = render_pool.submit(render_result_image, image_path, detected_boxes, output_image_path)
+    else:
+        render_result_image(image_path, detected_boxes, output_image_path)
 
     # Save JSON
     end_time = time.time()
@@ -364,15 +808,31 @@ def run_test(test_id, client, images_dir, output_dir, expected_localizations=Non
         'count_passed': count_passed,
         'loc_info': loc_info,
         'expected_boxes': expected_boxes,
+        'expected_array': expected_array,
         'input_image': image_path,
+        'input_pixels': input_image,
         'output_image': output_image_path,
-        'sign_details': [(p.name, p.score) for p in signs_detected],
-        'all_objects': [(o.name, o.score) for o in all_objects],
+        'render': render,
+        'sign_details': [(name, score) for name, score, _ in detected_boxes],
+        'all_objects': reported_objects,
         'duration': duration
     }
 
 
 def main():
+    global DISPLAY_ENABLED
+
+    parser = argparse.ArgumentParser(description="Run the AI signs & stoplights detection demo")
+    parser.add_argument('--headless', '--no-display', dest='headless', action='store_true',
+                        help="don't display figures; only write result images and JSON")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="ignore cached Vision API responses and refresh them")
+    args = parser.parse_args()
+    DISPLAY_ENABLED = not (args.headless or NO_GUI)
+    if args.headless and not NO_GUI:
+        # No figure has been created yet, so the GUI backend is never started
+        plt.switch_backend('Agg')
+
     base_path = script_dir
     images_dir = os.path.join(base_path, 'images', 'ai_tests')
     output_dir = setup_output_directory(base_path)
@@ -388,6 +848,8 @@ def main():
     # Load expected localizations
     print("Loading expected bounding box localizations...")
     expected_localizations = load_expected_localizations()
+    expected_boxes_by_test = index_expected_boxes(expected_localizations)
+    expected_arrays = expected_box_arrays(expected_boxes_by_test)
     if expected_localizations:
         print(f"  Loaded localizations for {len(expected_localizations.get('test_cases', {}))} test cases")
     else:
@@ -396,8 +858,8 @@ def main():
 
     # Initialize API client
     print("Initializing Google Cloud Vision API...")
-    client = vision.ImageAnnotatorClient()
-    print("API ready.\n")
+    client, connect_time = create_vision_client()
+    print(f"API ready (connected in {connect_time:.2f}s).\n")
 
     results = []
     test_ids = sorted(TEST_CASES.keys())
@@ -405,6 +867,53 @@ def main():
     # Start overall timer
     overall_start_time = time.time()
 
+    # The API calls are network-bound and independent, so issue them all up
+    # front, MAX_BATCH_SIZE images per request; results are still displayed
+    # one test at a time, in order, on the main thread because matplotlib is
+    # not thread-safe
+    found = [(test_id, find_image_path(images_dir, test_id)) for test_id in test_ids]
+    found = [(test_id, image_path) for test_id, image_path in found if image_path]
+    pool = ThreadPoolExecutor(max_workers=MAX_PARALLEL_REQUESTS)
+    # Spawn rather than fork: by now the gRPC channel and the request threads
+    # exist, and forking a process that holds them is unsafe
+    render_pool = ProcessPoolExecutor(
+        max_workers=MAX_RENDER_PROCESSES,
+        mp_context=multiprocessing.get_context('spawn'),
+    )
+    pending = {}
+
+    # Images unchanged since an earlier run reuse that run's response (and
+    # result image) instead of being sent again
+    cache_dir = os.path.join(base_path, 'results', '.vision_cache')
+    os.makedirs(cache_dir, exist_ok=True)
+    cached = {}
+    to_fetch = []
+    for test_id, image_path in found:
+        cache_path = response_cache_path(cache_dir, image_path)
+        objects = None if args.no_cache else load_cached_objects(cache_path)
+        if objects is None:
+            to_fetch.append((test_id, image_path, cache_path))
+            continue
+        done = Future()
+        done.set_result([objects])
+        pending[test_id] = (done, 0)
+        cached[test_id] = cache_path
+    if cached:
+        print(f"Using cached Vision API responses for {len(cached)} unchanged images\n")
+
+    for start in range(0, len(to_fetch), MAX_BATCH_SIZE):
+        chunk = to_fetch[start:start + MAX_BATCH_SIZE]
+        batch = pool.submit(call_vision_batch, client,
+                            [image_path for _, image_path, _ in chunk],
+                            [cache_path for _, _, cache_path in chunk])
+        for index, (test_id, _, _) in enumerate(chunk):
+            pending[test_id] = (batch, index)
+
+    # Decode the next inputs for display while the current test is shown
+    prefetched = None
+    if DISPLAY_ENABLED:
+        prefetched = prefetch_input_images([image_path for _, image_path in found])
+
     for i, test_id in enumerate(test_ids, 1):
         test_info = TEST_CASES[test_id]
 
@@ -422,19 +931,29 @@ def main():
         print(f"  Expected Signs/Stoplights Count: {test_info['expected']}")
 
         # Show expected bounding boxes info
+        expected_boxes = expected_boxes_by_test.get(test_id)
         if expected_localizations and 'test_cases' in expected_localizations:
-            test_data = expected_localizations['test_cases'].get(test_id)
-            if test_data and test_data.get('localizations'):
-                print(f"  Expected Bounding Boxes: {len(test_data['localizations'])}")
+            if expected_boxes:
+                print(f"  Expected Bounding Boxes: {len(expected_boxes)}")
             else:
                 print(f"  Expected Bounding Boxes: N/A")
 
         # Run test (this shows input image first, then processes)
-        result = run_test(test_id, client, images_dir, output_dir, expected_localizations)
+        input_image = None
+        if prefetched is not None and test_id in pending:
+            input_image = prefetched.get()
+        result = run_test(test_id, client, images_dir, output_dir, expected_boxes,
+                          pending_batch=pending.get(test_id), render_pool=render_pool,
+                          input_image=input_image, cached_response=cached.get(test_id),
+                          expected_array=expected_arrays.get(test_id))
 
         if result is None:
             print(f"\n{Colors.RED}ERROR: Image not found for {test_id}{Colors.END}")
             continue
+        if 'error' in result:
+            # No detections to judge, so the test is neither passed nor failed
+            print(f"\n{Colors.RED}ERROR: {result['error']} for {test_id}{Colors.END}")
+            continue
 
         # ACTUAL OUTPUT
         print(f"\n{Colors.CYAN}[ACTUAL OUTPUT]{Colors.END}")
@@ -443,9 +962,7 @@ def main():
 
         if result['all_objects']:
             print(f"\n  Objects from API:")
-            for name, score in result['all_objects']:
-                name_lower = name.lower()
-                is_sign = any(kw in name_lower for kw in ['sign', 'stop', 'traffic light', 'stoplight', 'traffic signal'])
+            for name, score, is_sign in result['all_objects']:
                 marker = " <-- SIGN/STOPLIGHT" if is_sign else ""
                 print(f"    - {name}: {score*100:.1f}%{marker}")
 
@@ -476,16 +993,25 @@ def main():
 
         print(f"  Duration: {result['duration']:.2f}s")
 
-        # Show before/after comparison
-        print(f"\n  Showing result comparison (Blue=Expected, Red=Detected)...")
-        show_before_after(result['input_image'], result['output_image'],
+        # Show before/after comparison once the worker has saved the image
+        if result['render'] is not None:
+            result['render'].result()
+        if DISPLAY_ENABLED:
+            print(f"\n  Showing result comparison (Blue=Expected, Red=Detected)...")
+        # Drop the decoded image from the result as it is displayed, so the
+        # summary does not keep every test's pixels alive
+        show_before_after(result.pop('input_pixels'), result['output_image'],
                           test_id, result['description'],
                           result['expected'], result['detected'], result['count_passed'],
-                          result['loc_info'], result.get('expected_boxes'))
+                          result['loc_info'], result.get('expected_boxes'), result.get('expected_array'))
 
         results.append(result)
         print()
 
+    pool.shutdown()
+    render_pool.shutdown()
+    plt.close('all')
+
     # Calculate overall execution time
     overall_end_time = time.time()
     overall_duration = overall_end_time - overall_start_time
@@ -502,12 +1028,14 @@ def main():
     # Calculate localization statistics
     loc_results = [r for r in results if r.get('loc_info')]
     if loc_results:
-        avg_iou_overall = sum(r['loc_info']['avg_iou'] for r in loc_results) / len(loc_results)
+        # Pull each test's values out of its loc_info once, then tally
+        ious = [r['loc_info']['avg_iou'] for r in loc_results]
+        avg_iou_overall = sum(ious) / len(ious)
         total_expected_boxes = sum(r['loc_info']['total'] for r in loc_results)
         total_matched_boxes = sum(r['loc_info']['matched'] for r in loc_results)
-        loc_good = sum(1 for r in loc_results if r['loc_info']['avg_iou'] >= 0.5)
-        loc_acceptable = sum(1 for r in loc_results if 0.3 <= r['loc_info']['avg_iou'] < 0.5)
-        loc_poor = sum(1 for r in loc_results if r['loc_info']['avg_iou'] < 0.3)
+        loc_good = sum(iou >= 0.5 for iou in ious)
+        loc_poor = sum(iou < 0.3 for iou in ious)
+        loc_acceptable = len(ious) - loc_good - loc_poor
 
     print(f"\n{'Test ID':<10} {'Expected':>10} {'Detected':>10} {'Count':>10} {'IoU':>10}")
     print("-" * 55)
@@ -0,0 +1,41 @@
+"""
+Unit tests for calculate_localization_score() in demo_ai_tests.py.
+
+Run from the Signs_Tests folder:
+    python -m unittest test_localization_score
+"""
+
+import unittest
+
+import numpy as np
+
+from demo_ai_tests import calculate_localization_score
+
+SQUARE = [(0.1, 0.1), (0.3, 0.1), (0.3, 0.3), (0.1, 0.3)]
+NO_EXPECTED = np.zeros((0, 4))
+
+
+class CalculateLocalizationScoreTest(unittest.TestCase):
+
+    def test_both_empty_is_perfect(self):
+        self.assertEqual(calculate_localization_score(NO_EXPECTED, []), (0, 1.0, []))
+
+    def test_empty_expected_with_low_score_detections_is_penalised(self):
+        detected = [('Stop sign', 0.1, SQUARE)]
+        self.assertEqual(calculate_localization_score(NO_EXPECTED, detected), (0, 0.0, []))
+
+    def test_empty_expected_with_confident_detections_is_penalised(self):
+        detected = [('Stop sign', 0.9, SQUARE)]
+        self.assertEqual(calculate_localization_score(NO_EXPECTED, detected), (0, 0.0, []))
+
+    def test_higher_score_detection_matches_first(self):
+        expected = np.array([[0.1, 0.1, 0.3, 0.3]])
+        shifted = [(x + 0.02, y) for x, y in SQUARE]
+        detected = [('Sign', 0.5, SQUARE), ('Sign', 0.9, shifted)]
+        matched_count, _, details = calculate_localization_score(expected, detected)
+        self.assertEqual(matched_count, 1)
+        self.assertEqual(details[0]['detected_id'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -9,10 +9,26 @@ This module contains common functions used across all AI test cases including:
 
 import os
 import json
+import functools
 from datetime import datetime
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
-import matplotlib.image as mpimg
+
+# save_json_output writes with orjson when it is installed, json otherwise
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Image extensions find_image_path looks for, in order of preference
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.bmp')
+
+# Substrings marking an object name as a sign/stoplight. 'stoplight' and
+# 'traffic signal' are already matched by 'stop' and 'sign'.
+SIGN_KEYWORDS = ('sign', 'stop', 'traffic light')
+
+# Resolution and JPEG quality of the 12x8 inch result images; they are only
+# for human review
+RESULT_DPI = 90
+RESULT_JPEG_QUALITY = 80
 
 
 def draw_bounding_boxes(image_path, sign_objects, output_path):
@@ -27,21 +43,66 @@ def draw_bounding_boxes(image_path, sign_objects, output_path):
     Returns:
         str: Path to the saved output image
     """
-    img = mpimg.imread(image_path)
-    fig, ax = plt.subplots(figsize=(12, 8))
+    return render_result_image(image_path, sign_boxes(sign_objects), output_path)
+
+
+def sign_boxes(sign_objects):
+    """
+    Convert detected objects to plain tuples that can be sent to another process.
+
+    Args:
+        sign_objects: List of detected signs/stoplights with bounding boxes
+
+    Returns:
+        list: (name, score, [(x, y), ...]) per object, vertices normalized
+    """
+    return [
+        (obj.name, obj.score, [(v.x, v.y) for v in obj.bounding_poly.normalized_vertices])
+        for obj in sign_objects
+    ]
+
+
+def render_result_image(image_path, boxes, output_path):
+    """
+    Draw sign_boxes() output on the image and save it.
+
+    Takes only picklable arguments, so it can run in a worker process (see
+    demo_ai_tests.py).
+
+    Args:
+        image_path: Path to the input image
+        boxes: List of (name, score, normalized vertices) tuples
+        output_path: Path to save the output image with bounding boxes
+
+    Returns:
+        str: Path to the saved output image
+    """
+    # Imported here so demo_all_tests.py, which only needs filter_signs,
+    # doesn't load matplotlib and PIL.
+    from matplotlib.collections import PolyCollection
+    from PIL import Image
+
+    # Decode the JPEG at a reduced scale (1/2, 1/4 or 1/8) when it is much
+    # larger than the figure (no-op for other formats). The file is closed once
+    # the decoded copy exists, so long-lived render workers don't hold it open
+    with Image.open(image_path) as source:
+        source.draft('RGB', (12 * RESULT_DPI, 8 * RESULT_DPI))
+        img = source.convert('RGB')
+
+    fig, ax = _result_figure()
+    ax.clear()
     ax.imshow(img)
 
-    img_height, img_width = img.shape[:2]
+    img_width, img_height = img.size
 
-    for i, obj in enumerate(sign_objects, 1):
-        vertices = obj.bounding_poly.normalized_vertices
-        coords = [(vertex.x * img_width, vertex.y * img_height) for vertex in vertices]
+    polygons = [[(x * img_width, y * img_height) for x, y in vertices] for _, _, vertices in boxes]
 
-        poly = patches.Polygon(coords, fill=False, edgecolor='red', linewidth=3)
-        ax.add_patch(poly)
+    # All outlines go into one collection, drawn in a single call
+    ax.add_collection(PolyCollection([p for p in polygons if p], edgecolors='red', facecolors='none', linewidths=3))
 
+    for i, ((name, score, _), coords) in enumerate(zip(boxes, polygons), 1):
         if coords:
-            label = f"Sign/Stoplight {i}: {obj.name} ({obj.score:.2f})"
+            label = f"Sign/Stoplight {i}: {name} ({score:.2f})"
             min_y = min(coord[1] for coord in coords)
             min_x = min(coord[0] for coord in coords)
             ax.text(min_x, min_y - 10, label,
@@ -49,13 +110,31 @@ def draw_bounding_boxes(image_path, sign_objects, output_path):
                    fontsize=10, color='white', weight='bold')
 
     ax.axis('off')
-    plt.tight_layout()
-    plt.savefig(output_path, bbox_inches='tight', dpi=150)
-    plt.close()
+    fig.tight_layout()
+    fig.savefig(output_path, dpi=RESULT_DPI, pil_kwargs={'quality': RESULT_JPEG_QUALITY, 'optimize': False})
 
     return output_path
 
 
+@functools.lru_cache(maxsize=1)
+def _result_figure():
+    """
+    Create the Figure render_result_image() redraws for every result image.
+
+    Built once per process instead of once per test; callers clear the axes
+    before drawing, so render_result_image() must not be called from several
+    threads at once. A bare Figure renders with Agg and never touches the
+    pyplot GUI backend the interactive demos use.
+
+    Returns:
+        tuple: (Figure, Axes)
+    """
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(12, 8))
+    return fig, fig.add_subplot()
+
+
 def find_image_path(base_path, test_id):
     """
     Find the image file with common extensions.
@@ -67,15 +146,34 @@ def find_image_path(base_path, test_id):
     Returns:
         str: Full path to the image file, or None if not found
     """
-    image_path = os.path.join(base_path, test_id)
-    image_extensions = ['.jpg', '.jpeg', '.png', '.gif', '.bmp']
+    return _index_dir(base_path).get(test_id)
+
+
+@functools.lru_cache(maxsize=None)
+def _index_dir(base_path):
+    """
+    Scan a directory once and return {test ID: image path}.
 
-    for ext in image_extensions:
-        test_path = image_path + ext
-        if os.path.exists(test_path):
-            return test_path
+    lru_cache keeps the result for the rest of the run. For duplicate IDs
+    the extension listed first in IMAGE_EXTENSIONS is kept.
+    """
+    try:
+        entries = list(os.scandir(base_path))
+    except FileNotFoundError:
+        return {}
+
+    candidates = []
+    for entry in entries:
+        test_id, ext = os.path.splitext(entry.name)
+        if ext in IMAGE_EXTENSIONS and entry.is_file():
+            candidates.append((IMAGE_EXTENSIONS.index(ext), test_id, entry.path))
+
+    # Assign least-preferred extensions first so preferred ones overwrite them
+    index = {}
+    for _, test_id, path in sorted(candidates, reverse=True):
+        index[test_id] = path
 
-    return None
+    return index
 
 
 def filter_signs(objects):
@@ -88,13 +186,24 @@ def filter_signs(objects):
     Returns:
         list: Filtered list containing only sign/stoplight objects
     """
-    sign_keywords = ['sign', 'stop', 'traffic light', 'stoplight', 'traffic signal']
-    result = []
-    for obj in objects:
-        name_lower = obj.name.lower()
-        if any(keyword in name_lower for keyword in sign_keywords):
-            result.append(obj)
-    return result
+    return [obj for obj in objects if is_sign_name(obj.name)]
+
+
+def is_sign_name(name):
+    """
+    Check whether a Vision API object name denotes a sign or stoplight.
+
+    Args:
+        name: Object name as returned by the API (any case)
+
+    Returns:
+        bool: True if the name contains one of SIGN_KEYWORDS
+    """
+    name_lower = name.lower()
+    for keyword in SIGN_KEYWORDS:
+        if keyword in name_lower:
+            return True
+    return False
 
 
 def create_json_output(test_id, signs_detected, output_files, timing_info=None, expected_count=None, test_passed=None):
@@ -166,16 +275,23 @@ def save_json_output(json_data, output_path):
     Returns:
         str: Path to saved JSON file
     """
-    with open(output_path, 'w') as json_file:
-        json.dump(json_data, json_file, indent=2)
+    if orjson is not None:
+        with open(output_path, 'wb') as json_file:
+            json_file.write(orjson.dumps(json_data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(output_path, 'w') as json_file:
+            json.dump(json_data, json_file, indent=2)
 
     return output_path
 
 
+@functools.lru_cache(maxsize=None)
 def setup_output_directory(base_path):
     """
     Create output directory if it doesn't exist.
 
+    Cached, so the directory is only created once per process.
+
     Args:
         base_path: Base path (Signs_Tests directory)
 
@@ -3,11 +3,28 @@
 AI Test Suite Demo Script for CMPE 187
 =====================================
 """
+import argparse
 import json
 import os
+import sys
+from io import BytesIO
 from vision_tester.gvision_interface import *
+import numpy as np
 from PIL import Image
 import matplotlib.image as mpimg
+import matplotlib
+
+# Use the non-GUI Agg backend when there is nothing to show figures on (no X11
+# or Wayland display on Linux, e.g. CI or SSH) or HEADLESS is set to anything
+# but 0/false; pyplot must not be imported before this. Same check as in
+# Signs_Tests/demo_ai_tests.py, keep the two in sync
+NO_GUI = os.environ.get('HEADLESS', '0').lower() not in ('', '0', 'false') or (
+    sys.platform.startswith('linux')
+    and not os.environ.get('DISPLAY')
+    and not os.environ.get('WAYLAND_DISPLAY')
+)
+if NO_GUI:
+    matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 from vision_tester.test_utils import * 
 import time
@@ -16,12 +33,39 @@ from datetime import datetime
 INPUT_DIR = "./input"
 OUTPUT_DIR = "./output"
 
-def show_before_after(input_image_path, output_image_path, test_id, detected, passed):
-    """Display input and output images side by side"""
-    fig, axes = plt.subplots(1, 2, figsize=(16, 8))
+# False for --no-display or without a GUI (NO_GUI): figures are skipped,
+# result images are still written
+DISPLAY_ENABLED = not NO_GUI
+
+# Open display figures by size, see display_figure()
+_DISPLAY_FIGURES = {}
+
+
+# Kept in sync with display_figure() in Signs_Tests/demo_ai_tests.py
+def display_figure(figsize, ncols=1):
+    """Clear and return the display figure of the given size, making it current.
+
+    Figures are kept open and reused across tests instead of creating and
+    closing a window for every show_* call; one is recreated if its window
+    was closed.
+    """
+    fig = _DISPLAY_FIGURES.get(figsize)
+    if fig is None or not plt.fignum_exists(fig.number):
+        fig = plt.figure(figsize=figsize)
+        _DISPLAY_FIGURES[figsize] = fig
+    else:
+        plt.figure(fig.number)
+        fig.clear()
+    return fig, fig.subplots(1, ncols)
+
+def show_before_after(img_input, output_image_path, test_id, detected, passed):
+    """Display input (an already decoded array) and output images side by side"""
+    if not DISPLAY_ENABLED:
+        return
+
+    fig, axes = display_figure((16, 8), ncols=2)
 
     # Input image (left)
-    img_input = mpimg.imread(input_image_path)
     axes[0].imshow(img_input)
     axes[0].set_title(f"INPUT: {test_id}\n", fontsize=12, fontweight='bold')
     axes[0].axis('off')
@@ -38,37 +82,52 @@ def show_before_after(input_image_path, output_image_path, test_id, detected, pa
     plt.tight_layout()
     plt.show(block=False)
     plt.pause(4)  # Show for 4 seconds
-    plt.close()
 
 
-def show_input_image(image_path, test_id):
-    """Display the input image before processing"""
-    img = mpimg.imread(image_path)
-    fig, ax = plt.subplots(figsize=(12, 8))
+def show_input_image(img, test_id):
+    """Display the input image (an already decoded array) before processing"""
+    if not DISPLAY_ENABLED:
+        return
+
+    fig, ax = display_figure((12, 8))
     ax.imshow(img)
     ax.set_title(f"INPUT IMAGE: {test_id}\n", fontsize=14, fontweight='bold')
     ax.axis('off')
     plt.tight_layout()
     plt.show(block=False)
     plt.pause(2)  # Show for 2 seconds
-    plt.close()
 
-def run_test(test):
+def run_test(test, objects=None, content=None, use_cache=True):
+    """Run one test.
+
+    objects are its localized objects and content its image file bytes, when
+    run_suite has already fetched them; otherwise they are loaded here.
+    use_cache=False sends the image to the API even if a cached response exists.
+    """
     print("-------------------------------------------")
     print("| Running test: " + test['name'])
     print("-------------------------------------------")
     # load image
     img_path = os.path.join(INPUT_DIR, test['file'])
     print("Loading image: " + img_path)
-    img = Image.open(img_path)
+    if content is None:
+        with open(img_path, 'rb') as f:
+            content = f.read()
+    img = Image.open(BytesIO(content))
+
+    # decode once for both figures
+    pixels = np.asarray(img) if DISPLAY_ENABLED else None
 
     # display image
-    show_input_image(img_path, test['name'])
+    show_input_image(pixels, test['name'])
 
     # call vision model
     start_time = time.time()
     start_timestamp = datetime.now().isoformat()
-    objects = localize_objects(img)
+    if objects is None:
+        # Send the file's bytes rather than img, which would be re-encoded and
+        # miss the cache entries localize_objects_batch keyed on the raw bytes
+        objects = localize_objects(content, use_cache=use_cache)
 
     end_time = time.time()
     duration = end_time - start_time
@@ -97,7 +156,7 @@ def run_test(test):
     draw_bounding_boxes(img_path, detected_objects, output_image_path)
 
     # display output
-    show_before_after(img_path, output_image_path,
+    show_before_after(pixels, output_image_path,
                       test['name'],
                       len(detected_objects), True) #todo add back in features
 
@@ -105,13 +164,36 @@ def run_test(test):
 
 
 
-def run_suite():
+def run_suite(use_cache=True):
     with open(INPUT_DIR + "/input_expected.json") as f:
-        tests = json.load(f)
-        for test in tests["input"]:
-            run_test(test)
-
-run_suite()
+        tests = json.load(f)["input"]
+
+    # Read every image once and send them up front in batched requests
+    # rather than one call per test
+    contents = []
+    for test in tests:
+        with open(os.path.join(INPUT_DIR, test['file']), 'rb') as f:
+            contents.append(f.read())
+    all_objects = localize_objects_batch(contents, use_cache=use_cache)
+
+    for test, objects, content in zip(tests, all_objects, contents):
+        run_test(test, objects, content, use_cache)
+
+    plt.close('all')
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Run the automated Vision API tests")
+    parser.add_argument('--no-display', action='store_true',
+                        help="don't display figures; only write result images")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="ignore cached Vision API responses and send every image")
+    args = parser.parse_args()
+    if args.no_display and not NO_GUI:
+        DISPLAY_ENABLED = False
+        # No figure has been created yet, so the GUI backend is never started
+        plt.switch_backend('Agg')
+
+    run_suite(use_cache=not args.no_cache)
 
 
 
@@ -47,7 +47,7 @@ from google.cloud import vision
 # Import filter functions from each test suite
 from People_Tests.tests.ai_tests.test_utils import filter_people
 from Car_Tests.tests.ai_tests.test_utils import filter_vehicles
-from Signs_Tests.tests.ai_tests.test_utils import filter_signs
+from Signs_Tests.tests.ai_tests.test_utils import filter_signs, save_json_output
 
 
 # Terminal colors
@@ -352,12 +352,6 @@ def create_json_output(test_id, detected_objects, output_files, timing_info, exp
     }
 
 
-def save_json_output(json_data, output_path):
-    """Save JSON data to file"""
-    with open(output_path, 'w') as f:
-        json.dump(json_data, f, indent=2)
-
-
 # ============================================================================
 # VISUALIZATION FUNCTIONS
 # ============================================================================
@@ -9,10 +9,20 @@ This module contains common functions used across all AI test cases including:
 
 import os
 import json
+import functools
 from datetime import datetime
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
-import matplotlib.image as mpimg
+
+# orjson is optional here; save_json_output uses the json module without it
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Image extensions find_image_path looks for, in order of preference
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.bmp')
+
+# Object names the Vision API uses for people/pedestrians (lowercase)
+PERSON_NAMES = frozenset({'person', 'people', 'pedestrian'})
 
 
 def draw_bounding_boxes(image_path, people_objects, output_path):
@@ -27,11 +37,24 @@ def draw_bounding_boxes(image_path, people_objects, output_path):
     Returns:
         str: Path to the saved output image
     """
-    img = mpimg.imread(image_path)
-    fig, ax = plt.subplots(figsize=(12, 8))
+    # A bare Figure renders with Agg and never touches the pyplot GUI
+    # backend automated_tests.py displays its figures with.
+    from matplotlib.figure import Figure
+    import matplotlib.patches as patches
+    from PIL import Image
+
+    # Decode the JPEG at a reduced scale (1/2, 1/4 or 1/8) when it is much
+    # larger than the 1200x800 px figure (no-op for other formats); only the
+    # converted copy outlives the with block, so the file is not left open
+    with Image.open(image_path) as source:
+        source.draft('RGB', (1200, 800))
+        img = source.convert('RGB')
+
+    fig = Figure(figsize=(12, 8))
+    ax = fig.add_subplot()
     ax.imshow(img)
 
-    img_height, img_width = img.shape[:2]
+    img_width, img_height = img.size
 
     for i, obj in enumerate(people_objects, 1):
         vertices = obj.bounding_poly.normalized_vertices
@@ -49,9 +72,8 @@ def draw_bounding_boxes(image_path, people_objects, output_path):
                    fontsize=10, color='white', weight='bold')
 
     ax.axis('off')
-    plt.tight_layout()
-    plt.savefig(output_path, bbox_inches='tight', dpi=150)
-    plt.close()
+    fig.tight_layout()
+    fig.savefig(output_path, bbox_inches='tight', dpi=100, pil_kwargs={'quality': 85})
 
     return output_path
 
@@ -67,15 +89,35 @@ def find_image_path(base_path, test_id):
     Returns:
         str: Full path to the image file, or None if not found
     """
-    image_path = os.path.join(base_path, test_id)
-    image_extensions = ['.jpg', '.jpeg', '.png', '.gif', '.bmp']
+    return _index_dir(base_path).get(test_id)
 
-    for ext in image_extensions:
-        test_path = image_path + ext
-        if os.path.exists(test_path):
-            return test_path
 
-    return None
+@functools.lru_cache(maxsize=None)
+def _index_dir(base_path):
+    """
+    Build a test ID -> image path lookup for base_path.
+
+    The directory is listed only on the first call for it. Preferred
+    extensions (earlier in IMAGE_EXTENSIONS) override later ones.
+    """
+    try:
+        entries = list(os.scandir(base_path))
+    except FileNotFoundError:
+        return {}
+
+    candidates = []
+    for entry in entries:
+        test_id, ext = os.path.splitext(entry.name)
+        if ext in IMAGE_EXTENSIONS and entry.is_file():
+            candidates.append((IMAGE_EXTENSIONS.index(ext), test_id, entry.path))
+
+    # Assign least-preferred extensions first so preferred ones overwrite them
+    index = {}
+    for _, test_id, path in sorted(candidates, reverse=True):
+        index[test_id] = path
+
+    return index
+
 
 def filter_vehicles(objects):
     return [obj for obj in objects if obj.name.lower() in ['car', 'truck' ]]
@@ -90,7 +132,7 @@ def filter_people(objects):
     Returns:
         list: Filtered list containing only people/pedestrian objects
     """
-    return [obj for obj in objects if obj.name.lower() in ['person', 'people', 'pedestrian']]
+    return [obj for obj in objects if obj.name.lower() in PERSON_NAMES]
 
 
 def create_json_output(test_id, people_detected, output_files, timing_info=None, expected_count=None, test_passed=None):
@@ -162,16 +204,23 @@ def save_json_output(json_data, output_path):
     Returns:
         str: Path to saved JSON file
     """
-    with open(output_path, 'w') as json_file:
-        json.dump(json_data, json_file, indent=2)
+    if orjson is not None:
+        with open(output_path, 'wb') as json_file:
+            json_file.write(orjson.dumps(json_data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(output_path, 'w') as json_file:
+            json.dump(json_data, json_file, indent=2)
 
     return output_path
 
 
+@functools.lru_cache(maxsize=None)
 def setup_output_directory(base_path):
     """
     Create output directory if it doesn't exist.
 
+    Cached, so the directory is only created once per process.
+
     Args:
         base_path: Base path (People_Tests directory)
 